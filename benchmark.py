@@ -0,0 +1,225 @@
+import os, sys, json, platform
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+from settings import *
+from level import World
+from enemy import Enemy
+from controls import ScriptedInput
+from profiler import FrameProfiler
+from scenes import SceneStack, WorldScene
+from level_compiler import ENEMY_IDS
+
+WALK_SCRIPT = [
+    (240, (pygame.K_RIGHT,)),
+    (120, (pygame.K_DOWN,)),
+    (240, (pygame.K_LEFT,)),
+    (120, (pygame.K_UP,))
+]
+
+FIGHT_SCRIPT = [
+    (20, (pygame.K_SPACE,)),
+    (10, (pygame.K_LEFT,)),
+    (20, (pygame.K_SPACE,)),
+    (10, (pygame.K_DOWN,)),
+    (20, (pygame.K_SPACE,)),
+    (10, (pygame.K_RIGHT,)),
+    (20, (pygame.K_SPACE,)),
+    (10, (pygame.K_UP,))
+]
+
+# ticks between two teleports of the transitions scenario
+TRANSITION_INTERVAL = 30
+
+
+class Scenario:
+    """
+    A scripted situation run against the real World and Level code.
+
+    Parameters:
+    - name: Name of the scenario.
+    - script: List of (steps, keys) tuples replayed by a ScriptedInput.
+    - enemies: Number of extra enemies spawned around the player.
+    - hook: Optional function called with the world and the tick number
+    before every simulation step.
+
+    Methods:
+    - setup(world): Prepare a freshly created world for the scenario.
+    - before_tick(world, tick): Apply the per-tick changes of the scenario.
+    """
+    def __init__(self, name, script, enemies = 0, hook = None):
+        """Initialize the scenario."""
+        self.name = name
+        self.script = script
+        self.enemies = enemies
+        self.hook = hook
+
+    def setup(self, world):
+        """Spawn the extra enemies of the scenario."""
+        if self.enemies:
+            spawn_enemies(world.level, self.enemies)
+
+    def before_tick(self, world, tick):
+        """
+        Keep the player alive, so the scenario is not cut short by a respawn,
+        and run the hook of the scenario.
+        """
+        world.player.health = world.player.stats["health"]
+        if self.hook:
+            self.hook(world, tick)
+
+
+def free_tiles(level):
+    """
+    Return the tiles of a level without boundaries, objects and map
+    transitions, sorted by their distance to the player.
+
+    Parameters:
+    - level: Instance of the Level class.
+
+    Returns:
+    - List of (column, row) tuples.
+    """
+    level_data = level.level_data
+    blocked = set()
+    for layer in ("boundary", "object", "map_transition"):
+        blocked.update((col, row) for col, row, _ in level_data.cells(layer))
+
+    player_col = level.world.player.rect.centerx // TILESIZE
+    player_row = level.world.player.rect.centery // TILESIZE
+    tiles = [(col, row) for row in range(level_data.rows) for col in range(level_data.columns)
+             if (col, row) not in blocked]
+    tiles.sort(key = lambda tile: (tile[0] - player_col) ** 2 + (tile[1] - player_row) ** 2)
+    # the tile of the player itself is left free
+    return tiles[1:]
+
+def spawn_enemies(level, count):
+    """
+    Spawn enemies of all types on the free tiles closest to the player.
+
+    Parameters:
+    - level: Instance of the Level class.
+    - count: Number of enemies to spawn.
+    """
+    names = list(ENEMY_IDS.values())
+    for index, (col, row) in enumerate(free_tiles(level)[:count]):
+        Enemy(names[index % len(names)],
+            (col * TILESIZE, row * TILESIZE),
+            [level.visible_sprites,
+            level.damageable_sprites],
+            level.obstacle_grid,
+            level.damage_player,
+            level.world.add_xp,
+            level.enemy_manager)
+
+def refill_energy(world, tick):
+    """Keep the energy of the player full, so every spell can be cast."""
+    world.player.energy = world.player.stats["energy"]
+
+def teleport_to_transition(world, tick):
+    """Place the player on one of the map transitions of the current level."""
+    if tick % TRANSITION_INTERVAL == 0:
+        transitions = world.level.level_data.transitions
+        if transitions:
+            x, y, _ = transitions[tick // TRANSITION_INTERVAL % len(transitions)]
+            world.player.move_to((x, y))
+
+
+SCENARIOS = {scenario.name : scenario for scenario in (
+    Scenario("idle", [(1, ())]),
+    Scenario("walk", WALK_SCRIPT),
+    Scenario("fight_50", FIGHT_SCRIPT, enemies = 50),
+    Scenario("fight_200", FIGHT_SCRIPT, enemies = 200),
+    Scenario("fight_1000", FIGHT_SCRIPT, enemies = 1000),
+    Scenario("flame_spam", [(1, (pygame.K_w,))], hook = refill_energy),
+    Scenario("transitions", [(1, ())], hook = teleport_to_transition)
+)}
+
+
+def run_scenario(scenario, ticks, warmup, render = True):
+    """
+    Run a scenario in a fresh world and collect its phase timings.
+
+    Parameters:
+    - scenario: Instance of Scenario.
+    - ticks: Number of measured simulation steps.
+    - warmup: Number of simulation steps run before measuring.
+    - render: Boolean indicating whether every step is drawn off-screen.
+
+    Returns:
+    - Dictionary with the number of ticks, the final number of enemies and
+    the statistics of every phase in milliseconds.
+    """
+    scenes = SceneStack()
+    world = World(ScriptedInput(scenario.script), scenes)
+    scenes.push(WorldScene(world))
+    scenario.setup(world)
+    # keep every measured frame, not only the recent ones shown by the overlay
+    profiler = world.profiler = FrameProfiler()
+
+    for tick in range(warmup + ticks):
+        profiler.enabled = tick >= warmup
+        pygame.event.pump()
+        scenario.before_tick(world, tick)
+        with profiler.measure("tick"):
+            scenes.update()
+        if render:
+            with profiler.measure("render"):
+                scenes.draw()
+        profiler.end_frame()
+
+    return {
+        "ticks" : ticks,
+        "enemies" : len(world.level.enemy_manager),
+        "phases" : profiler.summary()
+    }
+
+def main():
+    """Parse the arguments, run the selected scenarios and write the results as JSON."""
+    parser = ArgumentParser(description = "Run the MagiSpeech benchmark scenarios.")
+    parser.add_argument("scenarios", nargs = "*",
+                        help = f"scenarios to run, all by default: {', '.join(SCENARIOS)}")
+    parser.add_argument("--ticks", type = int, default = 600, help = "measured simulation steps per scenario")
+    parser.add_argument("--warmup", type = int, default = 60, help = "unmeasured simulation steps per scenario")
+    parser.add_argument("--no-render", action = "store_true", help = "only measure the simulation")
+    parser.add_argument("--output", help = "file to write the JSON results to, stdout by default")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name}")
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = {
+        "meta" : {
+            "python" : platform.python_version(),
+            "pygame" : pygame.version.ver,
+            "ticks" : args.ticks,
+            "warmup" : args.warmup,
+            "render" : not args.no_render
+        },
+        "scenarios" : {}
+    }
+    # the game prints debug messages, they must not end up in the JSON output
+    with redirect_stdout(sys.stderr):
+        for name in args.scenarios or SCENARIOS:
+            print(f"running {name}")
+            results["scenarios"][name] = run_scenario(SCENARIOS[name], args.ticks, args.warmup, not args.no_render)
+
+    output = json.dumps(results, indent = 2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
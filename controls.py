@@ -0,0 +1,93 @@
+import pygame
+
+# a short patrol with sword swings and spells, looped by the headless mode
+DEMO_SCRIPT = [
+    (90, (pygame.K_RIGHT,)),
+    (20, (pygame.K_SPACE,)),
+    (90, (pygame.K_DOWN,)),
+    (20, (pygame.K_w,)),
+    (90, (pygame.K_LEFT,)),
+    (10, (pygame.K_q,)),
+    (20, (pygame.K_w,)),
+    (90, (pygame.K_UP,)),
+    (30, ())
+]
+
+
+class KeyboardInput:
+    """
+    Input source reading the state of the real keyboard.
+
+    Methods:
+    - advance(): Move to the next simulation step, nothing to do for the keyboard.
+    - get_pressed(): Return the state of all keyboard keys.
+    """
+    def advance(self):
+        """Move to the next simulation step."""
+        pass
+
+    def get_pressed(self):
+        """Return the state of all keyboard keys, indexable by key constant."""
+        return pygame.key.get_pressed()
+
+
+class ScriptedKeys:
+    """
+    Key state of a single simulation step of a ScriptedInput, indexable
+    by key constant like the result of pygame.key.get_pressed().
+
+    Parameters:
+    - keys: Collection of the pressed key constants.
+    """
+    def __init__(self, keys):
+        """Initialize the key state with the pressed keys."""
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        """Return whether the key is pressed."""
+        return key in self.keys
+
+
+class ScriptedInput:
+    """
+    Input source replaying a fixed script of key presses, one entry per
+    simulation step, so the game can run without a keyboard or a window.
+
+    Parameters:
+    - script: List of (steps, keys) tuples, holding the keys for the given
+    number of simulation steps.
+    - loop: Boolean indicating whether the script starts over when it ends.
+
+    Attributes:
+    - script: List of (steps, keys) tuples.
+    - loop: Boolean indicating whether the script starts over when it ends.
+    - tick: Number of simulation steps since the start of the script.
+    - length: Number of simulation steps of the whole script.
+    - pressed: ScriptedKeys of the current simulation step.
+
+    Methods:
+    - advance(): Move to the next simulation step of the script.
+    - get_pressed(): Return the key state of the current simulation step.
+    """
+    def __init__(self, script = DEMO_SCRIPT, loop = True):
+        """Initialize the input at the start of the script."""
+        self.script = script
+        self.loop = loop
+        self.tick = -1
+        self.length = sum(steps for steps, _ in script)
+        self.pressed = ScriptedKeys(())
+
+    def advance(self):
+        """Move to the next simulation step of the script."""
+        self.tick += 1
+        tick = self.tick % self.length if self.loop and self.length else self.tick
+        for steps, keys in self.script:
+            if tick < steps:
+                self.pressed = ScriptedKeys(keys)
+                return
+            tick -= steps
+        self.pressed = ScriptedKeys(())
+
+    def get_pressed(self):
+        """Return the key state of the current simulation step."""
+        return self.pressed
@@ -2,6 +2,7 @@ import pygame
 from settings import *
 from entity import Entity
 from helpers import *
+from enemy_manager import SlotAttribute
 
 class Enemy(Entity):
     """
@@ -17,7 +18,7 @@ class Enemy(Entity):
     image.
     - hitbox: A Pygame rect representing the hitbox of the enemy for
     collision detection.
-    - obstacle_sprites: A Pygame sprite group representing obstacle sprites
+    - obstacle_grid: An OccupancyGrid indexing the obstacle sprites
     in the level.
     - enemy_name: A string representing the name of the enemy character.
     - health: An integer representing the current health points of the enemy.
@@ -50,29 +51,49 @@ class Enemy(Entity):
     - invincibility_duration: An integer representing the duration of
     invincibility after being hit.
 
+    - manager: The EnemyManager of the level, storing the per-enemy data
+    marked as slot attributes and running the AI of all enemies.
+    - slot: Index of the enemy in the arrays of the manager.
+    - attack_timer: Timer ending the attack cooldown, or None.
+    - hit_timer: Timer ending the invincibility after a hit, or None.
+
     Methods:
-    - __init__(self, name, position, groups, obstacle_sprites, 
-                damage_player, add_xp): 
+    - __init__(self, name, position, groups, obstacle_grid, 
+                damage_player, add_xp, manager): 
     Initialize an enemy instance with the given attributes.
     - import_graphics(self, name): Load enemy graphics/animations from files.
-    - get_player_distance_direction(self, player): Calculate the distance and
+    - get_player_distance_direction(self): Return the distance and
     direction vector from the enemy to the player.
-    - get_status(self, player): Determine the status of the enemy based on the
-    player's position.
-    - actions(self, player): Perform actions based on the enemy's status.
+    - set_status(self, status): Switch the enemy to a new status.
+    - attack(self, current_time): Attack the player.
     - animate(self): Animate the enemy based on its current status.
-    - cooldowns(self): Manage cooldowns for the enemy's actions.
+    - allow_attack(self): End the attack cooldown.
     - get_damage(self, player, attack_type): Inflict damage on the enemy.
+    - end_invincibility(self): Make the enemy vulnerable again.
     - check_death(self): Check if the enemy has been defeated.
     - hit_reaction(self): Handle the reaction of the enemy when hit.
-    - update(self): Update the enemy's state and behavior.
-    - enemy_update(self, player): Update the enemy's behavior based on the
-    player's position.
+    - update(self, animate): Update the enemy's movement and animation.
+    - kill(self): Remove the enemy from its groups and its manager.
     """
-    def __init__(self, name, position, groups, obstacle_sprites, damage_player, add_xp):
+    # enemies are as wide as a tile, so they slide around corners to follow their path
+    corner_tolerance = ENEMY_CORNER_TOLERANCE
+
+    health = SlotAttribute("health")
+    attack_radius = SlotAttribute("attack_radius")
+    notice_radius = SlotAttribute("notice_radius")
+    can_attack = SlotAttribute("can_attack")
+    attack_time = SlotAttribute("attack_time")
+    attack_cooldown = SlotAttribute("attack_cooldown")
+    vulnerable = SlotAttribute("vulnerable")
+    hit_time = SlotAttribute("hit_time")
+    invincibility_duration = SlotAttribute("invincibility_duration")
+
+    def __init__(self, name, position, groups, obstacle_grid, damage_player, add_xp, manager):
         """Initialize an enemy instance."""
         super().__init__(groups)
         self.sprite_type = "enemy"
+        self.manager = manager
+        self.manager.add(self)
 
         self.import_graphics(name)
         self.status = "idle"
@@ -80,7 +101,7 @@ class Enemy(Entity):
         
         self.rect = self.image.get_rect(topleft = position)
         self.hitbox = self.rect.inflate(0,-10)
-        self.obstacle_sprites = obstacle_sprites
+        self.obstacle_grid = obstacle_grid
 
         self.enemy_name = name
         enemy_info = enemies_data[self.enemy_name]
@@ -94,15 +115,19 @@ class Enemy(Entity):
         self.attack_type = enemy_info['attack_type']
 
         self.can_attack = True
-        self.attack_time = None
+        self.attack_time = 0
         self.attack_cooldown = 400
         self.damage_player = damage_player
 
         self.vulnerable = True
-        self.hit_time = None
+        self.hit_time = 0
         self.invincibility_duration = 300
+        self.attack_timer = None
+        self.hit_timer = None
 
         self.add_xp = add_xp
+        self.manager.sync(self)
+        self.relocate()
 
     def import_graphics(self, name):
         """
@@ -120,62 +145,39 @@ class Enemy(Entity):
         for animation in self.animations.keys():
             self.animations[animation] = import_folder(main_path + animation)
 
-    def get_player_distance_direction(self, player):
+    def get_player_distance_direction(self):
         """
-        Calculate the distance and direction vector from the enemy to 
-        the player.
-
-        Parameters:
-        - player: Instance of the Player class representing the player
-        character.
+        Return the distance and direction vector from the enemy to 
+        the player, as computed by the manager in the last tick.
 
         Returns:
         - Tuple containing the distance and direction vector.
         """
-        enemy_vec = pygame.math.Vector2(self.rect.center)
-        player_vec = pygame.math.Vector2(player.rect.center)
-        distance = (player_vec - enemy_vec).magnitude()
-        
-        if distance > 0:
-            direction = (player_vec - enemy_vec).normalize()
-        else:
-            direction = pygame.math.Vector2()
+        distance = self.manager.distance[self.slot].item()
+        direction = pygame.math.Vector2(self.manager.direction[self.slot].tolist())
         return (distance, direction)
 
-    def get_status(self, player):
+    def set_status(self, status):
         """
-        Determine the status of the enemy based on the player's position.
+        Switch the enemy to a new status, restarting the animation
+        when an attack begins.
 
         Parameters:
-        - player: Instance of the Player class representing the player
-        character.
+        - status: String with the new status ("idle", "move" or "attack").
         """
-        distance = self.get_player_distance_direction(player)[0]
-        
-        if distance <= self.attack_radius and self.can_attack:
-            if self.status != "attack":
-                self.frame_index = 0
-            self.status = "attack"
-        elif distance <= self.notice_radius:
-            self.status = "move"
-        else:
-            self.status = "idle"
-
-    def actions(self, player):
+        if status == "attack" and self.status != "attack":
+            self.frame_index = 0
+        self.status = status
+
+    def attack(self, current_time):
         """
-        Perform actions based on the enemy's status.
+        Attack the player.
 
         Parameters:
-        - player: Instance of the Player class representing the player
-        character.
+        - current_time: Integer with the current time in milliseconds.
         """
-        if self.status == "attack":
-            self.attack_time = pygame.time.get_ticks()
-            self.damage_player(self.attack_damage, self.attack_type)
-        elif self.status == "move":
-            self.direction = self.get_player_distance_direction(player)[1]
-        else:
-            self.direction = pygame.math.Vector2()
+        self.attack_time = current_time
+        self.damage_player(self.attack_damage, self.attack_type)
 
     def animate(self):
         """Animate the enemy based on its current status."""
@@ -183,22 +185,20 @@ class Enemy(Entity):
         self.frame_index += self.animation_speed
         if self.frame_index >= len(self.animations[self.status]):
             if self.status == "attack":
+                # the cooldown starts when the attack animation ends
                 self.can_attack = False
+                if self.attack_timer:
+                    self.attack_timer.cancel()
+                self.attack_timer = self.manager.timers.schedule(self.attack_cooldown, self.allow_attack)
             self.frame_index = 0
 
         self.image = animation[int(self.frame_index)]
         self.rect = self.image.get_rect(center = self.hitbox.center)
 
-    def cooldowns(self):
-        """Manage cooldowns for the enemy's actions."""
-        current_time = pygame.time.get_ticks()
-        if not self.can_attack:
-            if current_time - self.attack_time >= self.attack_cooldown:
-                self.can_attack = True
-
-        if not self.vulnerable:
-            if current_time - self.hit_time >= self.invincibility_duration:
-                self.vulnerable = True
+    def allow_attack(self):
+        """End the attack cooldown."""
+        self.attack_timer = None
+        self.can_attack = True
 
     def get_damage(self, player, attack_type):
         """
@@ -209,14 +209,21 @@ class Enemy(Entity):
         - attack_type: String representing the type of attack.
         """
         if self.vulnerable:
-            self.direction = self.get_player_distance_direction(player)[1]
+            self.direction = self.get_player_distance_direction()[1]
+            self.manager.knocked.add(self.slot)
             
             if attack_type == "weapon":
                 self.health -= player.get_full_weapon_damage()
 
-            self.hit_time = pygame.time.get_ticks()
+            self.hit_time = self.manager.timers.time
             self.vulnerable = False
-    
+            self.hit_timer = self.manager.timers.schedule(self.invincibility_duration, self.end_invincibility)
+
+    def end_invincibility(self):
+        """Make the enemy vulnerable again."""
+        self.hit_timer = None
+        self.vulnerable = True
+
     def check_death(self):
         """Check if the enemy has been defeated."""
         if self.health <= 0:
@@ -228,20 +235,27 @@ class Enemy(Entity):
         if not self.vulnerable:
             self.direction *= -self.resistance
 
-    def update(self):
-        """Update the enemy's state and behavior."""
-        self.hit_reaction()
-        self.move(self.speed)
-        self.animate()
-        self.cooldowns()
-        self.check_death()
-
-    def enemy_update(self, player):
+    def update(self, animate = True):
         """
-        Update the enemy's behavior based on the player's position.
+        Update the enemy's movement and animation.
 
         Parameters:
-        - player: Instance of the Player class representing the player character.
+        - animate: Boolean indicating whether the animation is advanced,
+        False for enemies simulated at a reduced level of detail.
         """
-        self.get_status(player)
-        self.actions(player)
\ No newline at end of file
+        self.hit_reaction()
+        self.move(self.speed)
+        if animate:
+            self.animate()
+        self.manager.sync(self)
+        self.relocate()
+
+    def kill(self):
+        """Remove the enemy from its groups and its manager, cancelling its timers."""
+        for timer in (self.attack_timer, self.hit_timer):
+            if timer:
+                timer.cancel()
+        self.attack_timer = self.hit_timer = None
+        if self.slot is not None:
+            self.manager.remove(self)
+        super().kill()
@@ -0,0 +1,460 @@
+import numpy as np
+import pygame
+from math import sqrt
+from time import perf_counter
+from settings import *
+
+# status codes of the enemies, indexes into STATUS_NAMES
+IDLE = 0
+MOVE = 1
+ATTACK = 2
+STATUS_NAMES = ("idle", "move", "attack")
+
+# simulation level of detail tiers, indexes into TIER_NAMES
+FULL = 0
+REDUCED = 1
+DORMANT = 2
+TIER_NAMES = ("full", "reduced", "dormant")
+
+
+class SlotAttribute:
+    """
+    Attribute of an enemy that is stored in the enemy's slot of one of
+    the EnemyManager arrays, so the sprite code can keep using plain
+    attribute access.
+
+    Parameters:
+    - name: Name of the EnemyManager array.
+    """
+    def __init__(self, name):
+        """Initialize the attribute for the given array."""
+        self.name = name
+
+    def __get__(self, enemy, owner = None):
+        """Read the value from the slot of the enemy."""
+        if enemy is None:
+            return self
+        return getattr(enemy.manager, self.name)[enemy.slot].item()
+
+    def __set__(self, enemy, value):
+        """Write the value into the slot of the enemy."""
+        getattr(enemy.manager, self.name)[enemy.slot] = value
+
+
+class EnemyManager:
+    """
+    Structure-of-arrays store of the enemies of a level, running the
+    enemy AI for all of them in one batched NumPy pass per tick.
+
+    Each enemy owns a slot in the arrays. The enemies write their position
+    into it after moving, and the manager writes the resulting status and
+    direction back to the sprites.
+
+    Enemies are simulated with a level of detail depending on their distance
+    to the player: near or active enemies get full updates every tick,
+    enemies up to LOD_WAKE_RADIUS decide and move only every
+    LOD_REDUCED_INTERVAL ticks without animation, and enemies further
+    away are dormant and not updated at all.
+
+    Distances are computed for all enemies every tick, but applying the
+    resulting decisions to the sprites is time-sliced: the due enemies are
+    visited round-robin until AI_BUDGET_MS is spent, and the rest keep
+    their last decision until a later tick. Enemies knocked back by a hit
+    are decided in every tick until their invincibility ends.
+
+    The attack cooldowns and invincibility windows are not polled: the
+    enemies schedule their end with the TimerScheduler.
+
+    Before moving, every chasing enemy is steered away from the enemies
+    within SEPARATION_RADIUS, found through the cells of the crowd spatial
+    hash, so chasing enemies do not stack up on the same spot while the
+    cost stays linear in the number of enemies.
+
+    Parameters:
+    - timers: The TimerScheduler on simulation time.
+    - crowd: SpatialHash containing the enemies, used for neighbour queries.
+    - flow_field: FlowField of the level, leading the chasing enemies around walls.
+    - line_of_sight: LineOfSight of the level, hiding the player behind walls
+    from idle enemies.
+    - capacity: Initial number of slots, the arrays grow when needed.
+
+    Attributes:
+    - timers: The TimerScheduler on simulation time.
+    - crowd: SpatialHash containing the enemies.
+    - flow_field: FlowField of the level.
+    - line_of_sight: LineOfSight of the level.
+    - enemies: List of the enemy sprites, indexed by slot.
+    - count: Number of used slots.
+    - positions: Array of the enemy centers.
+    - health: Array of the enemy health points.
+    - attack_radius: Array of the radii within which enemies attack.
+    - notice_radius: Array of the radii within which enemies notice the player.
+    - can_attack: Array of flags telling whether an enemy can attack.
+    - vulnerable: Array of flags telling whether an enemy can be damaged.
+    - attack_time: Array of the times of the last attacks.
+    - attack_cooldown: Array of the cooldowns between attacks.
+    - hit_time: Array of the times the enemies were last hit.
+    - invincibility_duration: Array of the invincibility durations after a hit.
+    - status: Array of the status codes (IDLE, MOVE, ATTACK).
+    - distance: Array of the distances to the player from the last tick.
+    - direction: Array of the unit directions from the enemies straight to
+    the player from the last tick.
+    - path_direction: Array of the unit directions the chasing enemies move
+    in to reach the player, following the flow field, from the last tick.
+    - knocked: Set of the slots knocked back by a hit whose invincibility
+    has not ended yet.
+    - tier: Array of the level of detail tiers (FULL, REDUCED, DORMANT).
+    - tier_counts: Dictionary with the number of enemies in each tier
+    in the last tick, for tuning the LOD radii.
+    - tick: Number of ticks run so far.
+    - last_decision: Array of the ticks of the last AI decision of each enemy.
+    - cursor: Slot at which the next round-robin pass starts.
+    - budget: Time budget for the AI decisions of a tick in seconds.
+    - decisions: Number of AI decisions made in the last tick.
+    - max_staleness: Largest number of ticks since the last decision of a
+    non-dormant enemy, measured in the last tick.
+
+    Methods:
+    - add(enemy): Give an enemy a slot in the arrays.
+    - remove(enemy): Free the slot of an enemy.
+    - sync(enemy): Store the current position of an enemy.
+    - sight(slots, player): Return which enemies can see the player.
+    - separate(enemy): Steer an enemy away from its neighbours.
+    - update_sprites(): Update the movement and animation of the enemies
+    according to their tier.
+    - staleness(enemy): Return the number of ticks since an enemy last decided.
+    - decide(slot, status, direction, current_time): Apply an AI decision to an enemy.
+    - update(player): Run the sprite updates, death checks and AI.
+    - __len__(): Return the number of enemies.
+    """
+    def __init__(self, timers, crowd, flow_field, line_of_sight, capacity = 64, budget_ms = AI_BUDGET_MS):
+        """
+        Initialize an empty manager.
+
+        Parameters:
+        - timers: The TimerScheduler on simulation time.
+        - crowd: SpatialHash containing the enemies.
+        - flow_field: FlowField of the level.
+        - line_of_sight: LineOfSight of the level.
+        - capacity: Initial number of slots.
+        - budget_ms: Time budget for the AI decisions of a tick in milliseconds.
+        """
+        self.timers = timers
+        self.crowd = crowd
+        self.flow_field = flow_field
+        self.line_of_sight = line_of_sight
+        self.enemies = []
+        self.count = 0
+        self.knocked = set()
+        self.tick = 0
+        self.cursor = 0
+        self.budget = budget_ms / 1000
+        self.decisions = 0
+        self.max_staleness = 0
+        self.tier_counts = dict.fromkeys(TIER_NAMES, 0)
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """
+        Allocate the arrays with the given number of slots, keeping the
+        data of the used ones.
+
+        Parameters:
+        - capacity: Number of slots.
+        """
+        old = getattr(self, "positions", None)
+        arrays = {
+            "positions" : np.zeros((capacity, 2)),
+            "health" : np.zeros(capacity),
+            "attack_radius" : np.zeros(capacity),
+            "notice_radius" : np.zeros(capacity),
+            "can_attack" : np.ones(capacity, dtype = bool),
+            "vulnerable" : np.ones(capacity, dtype = bool),
+            "attack_time" : np.zeros(capacity),
+            "attack_cooldown" : np.zeros(capacity),
+            "hit_time" : np.zeros(capacity),
+            "invincibility_duration" : np.zeros(capacity),
+            "status" : np.zeros(capacity, dtype = np.int8),
+            "distance" : np.zeros(capacity),
+            "direction" : np.zeros((capacity, 2)),
+            "path_direction" : np.zeros((capacity, 2)),
+            "tier" : np.zeros(capacity, dtype = np.int8),
+            "last_decision" : np.zeros(capacity, dtype = np.int64),
+        }
+        for name, array in arrays.items():
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+
+    def __len__(self):
+        """Return the number of enemies."""
+        return self.count
+
+    def add(self, enemy):
+        """
+        Give an enemy a slot in the arrays.
+
+        Parameters:
+        - enemy: Instance of the Enemy class.
+        """
+        if self.count == len(self.positions):
+            self.allocate(len(self.positions) * 2)
+
+        slot = self.count
+        self.count += 1
+        self.enemies.append(enemy)
+        enemy.slot = slot
+
+        self.can_attack[slot] = True
+        self.vulnerable[slot] = True
+        self.attack_time[slot] = 0
+        self.hit_time[slot] = 0
+        self.status[slot] = IDLE
+        self.distance[slot] = 0
+        self.direction[slot] = 0
+        self.path_direction[slot] = 0
+        self.tier[slot] = FULL
+        self.last_decision[slot] = self.tick
+
+    def remove(self, enemy):
+        """
+        Free the slot of an enemy by moving the last enemy into it.
+
+        Parameters:
+        - enemy: Instance of the Enemy class.
+        """
+        slot = enemy.slot
+        last = self.count - 1
+        if slot != last:
+            moved = self.enemies[last]
+            self.enemies[slot] = moved
+            moved.slot = slot
+            for name in ("positions", "health", "attack_radius", "notice_radius", "can_attack",
+                         "vulnerable", "attack_time", "attack_cooldown", "hit_time",
+                         "invincibility_duration", "status", "distance", "direction", "path_direction",
+                         "tier", "last_decision"):
+                array = getattr(self, name)
+                array[slot] = array[last]
+            # the slot now belongs to the moved enemy, which is only knocked back if it was hit itself
+            self.knocked.discard(slot)
+            if last in self.knocked:
+                self.knocked.discard(last)
+                self.knocked.add(slot)
+
+        self.knocked.discard(last)
+        self.enemies.pop()
+        self.count -= 1
+        enemy.slot = None
+
+    def sync(self, enemy):
+        """
+        Store the current position of an enemy after it moved.
+
+        Parameters:
+        - enemy: Instance of the Enemy class.
+        """
+        self.positions[enemy.slot] = enemy.rect.center
+
+    def sight(self, slots, player):
+        """
+        Return which enemies can see the player, tested only for the given
+        slots through the cached tile line of sight.
+
+        Parameters:
+        - slots: Array of the slots to test.
+        - player: Instance of the Player class representing the player character.
+
+        Returns:
+        - Array of flags for all enemies, False for the slots not tested.
+        """
+        sight = np.zeros(self.count, dtype = bool)
+        if len(slots):
+            player_tile = self.line_of_sight.tile(player.rect.center)
+            tiles = (self.positions[slots] // TILESIZE).astype(np.int64).tolist()
+            visible = self.line_of_sight.visible
+            sight[slots] = [visible((col, row), player_tile) for col, row in tiles]
+        return sight
+
+    def separate(self, enemy):
+        """
+        Set the steering of an enemy to point away from the enemies closer
+        than SEPARATION_RADIUS, the closer the stronger. Only the enemies in
+        the cells of the crowd hash around the enemy are looked at.
+
+        Parameters:
+        - enemy: Instance of the Enemy class.
+        """
+        steering = enemy.steering
+        steering.update(0, 0)
+        radius = SEPARATION_RADIUS
+        radius_squared = radius * radius
+        x, y = enemy.rect.center
+        area = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
+
+        neighbours = 0
+        # steering lookups are not counted, the query statistics belong to the hit tests
+        for other in self.crowd.nearby(area):
+            other_x, other_y = other.rect.center
+            dx = x - other_x
+            dy = y - other_y
+            distance_squared = dx * dx + dy * dy
+            if distance_squared >= radius_squared or other is enemy:
+                continue
+            distance = sqrt(distance_squared)
+            if distance == 0:
+                # enemies on the same spot are split apart by their slots
+                dx, distance = (1, 1) if enemy.slot > other.slot else (-1, 1)
+            weight = (radius - distance) / (radius * distance)
+            steering.x += dx * weight
+            steering.y += dy * weight
+            neighbours += 1
+            if neighbours == SEPARATION_NEIGHBOURS:
+                break
+
+        if steering.magnitude() > SEPARATION_STRENGTH:
+            steering.scale_to_length(SEPARATION_STRENGTH)
+
+    def update_sprites(self):
+        """
+        Update the movement and animation of the enemies according to
+        the tiers of the last tick, steering them away from their neighbours
+        first. Dormant enemies are skipped.
+        """
+        n = self.count
+        tier = self.tier[:n]
+        enemies = self.enemies
+        # standing enemies keep their steering at zero, only the moving ones avoid each other
+        moving = self.status[:n] != IDLE
+        for slot in np.flatnonzero(tier == FULL).tolist():
+            if moving[slot]:
+                self.separate(enemies[slot])
+            elif enemies[slot].steering:
+                enemies[slot].steering.update(0, 0)
+            enemies[slot].update()
+
+        reduced = (tier == REDUCED) & ((np.arange(n) + self.tick) % LOD_REDUCED_INTERVAL == 0)
+        for slot in np.flatnonzero(reduced).tolist():
+            if moving[slot]:
+                self.separate(enemies[slot])
+            elif enemies[slot].steering:
+                enemies[slot].steering.update(0, 0)
+            enemies[slot].update(animate = False)
+
+    def update(self, player):
+        """
+        Update the enemy sprites, then run the death checks and AI
+        decisions of all enemies in batched array operations and write
+        the results back to the sprites.
+
+        Parameters:
+        - player: Instance of the Player class representing the player character.
+        """
+        n = self.count
+        if not n:
+            return
+        self.tick += 1
+        self.update_sprites()
+
+        current_time = self.timers.time
+        for slot in np.flatnonzero(self.health[:n] <= 0)[::-1]:
+            self.enemies[slot].check_death()
+        n = self.count
+        if not n:
+            return
+
+        delta = np.asarray(player.rect.center, dtype = float) - self.positions[:n]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        safe_distance = np.where(distance > 0, distance, 1)
+        direction = np.where(distance[:, None] > 0, delta / safe_distance[:, None], 0)
+        # away from the player the chasing enemies follow the shared flow field instead of a straight line
+        path_direction = direction
+        if (self.status[:n] == MOVE).any():
+            self.flow_field.update(player.rect.center)
+            path_direction = self.flow_field.directions(self.positions[:n], direction)
+        self.distance[:n] = distance
+        self.direction[:n] = direction
+        self.path_direction[:n] = path_direction
+        # knocked back enemies keep the straight direction, so hit_reaction pushes them away from the player
+        path_direction = np.where(self.vulnerable[:n, None], path_direction, direction)
+
+        # enemies that are chasing or attacking stay fully simulated wherever they are
+        previous = self.status[:n]
+        tier = np.where((distance <= LOD_NEAR_RADIUS) | (previous != IDLE), FULL,
+                        np.where(distance <= LOD_WAKE_RADIUS, REDUCED, DORMANT))
+        self.tier[:n] = tier
+        self.tier_counts = dict(zip(TIER_NAMES, np.bincount(tier, minlength = len(TIER_NAMES)).tolist()))
+
+        # idle enemies only notice a player they can see, chasing ones keep following around walls
+        in_range = distance <= self.notice_radius[:n]
+        sight = self.sight(np.flatnonzero(in_range), player)
+        noticed = in_range & (sight | (previous != IDLE))
+        status = np.where((distance <= self.attack_radius[:n]) & self.can_attack[:n] & sight, ATTACK,
+                          np.where(noticed, MOVE, IDLE))
+
+        # visit the due enemies round-robin, starting where the last tick stopped
+        staleness = self.tick - self.last_decision[:n]
+        due = (tier == FULL) | ((tier == REDUCED) & (staleness >= LOD_REDUCED_INTERVAL))
+        # enemies staying idle have nothing to apply, their decision is recorded in bulk
+        work = (status != previous) | (status != IDLE)
+        self.last_decision[:n][due & ~work] = self.tick
+        due &= work
+
+        # hit_reaction reverses the direction every tick of the invincibility after
+        # a hit, so knocked back enemies are decided outside the budget until it
+        # ends and no deferred enemy flips back and forth; idle ones stand still
+        self.decisions = 0
+        for slot in sorted(self.knocked):
+            self.decide(slot, status[slot], path_direction[slot], current_time)
+            if status[slot] == IDLE:
+                self.enemies[slot].direction.update(0, 0)
+            due[slot] = False
+            self.decisions += 1
+        self.knocked = {slot for slot in self.knocked if not self.vulnerable[slot]}
+
+        due = np.flatnonzero(due)
+        order = np.concatenate((due[due >= self.cursor], due[due < self.cursor])).tolist()
+        deadline = perf_counter() + self.budget
+        decided = self.decisions
+        for slot in order:
+            if self.decisions >= AI_MIN_DECISIONS and perf_counter() > deadline:
+                break
+            self.decide(slot, status[slot], path_direction[slot], current_time)
+            self.decisions += 1
+            self.cursor = slot + 1
+        if self.decisions - decided == len(order):
+            self.cursor = 0
+
+        active = tier != DORMANT
+        self.max_staleness = int((self.tick - self.last_decision[:n][active]).max(initial = 0))
+
+    def staleness(self, enemy):
+        """
+        Return the number of ticks since an enemy last made an AI decision.
+
+        Parameters:
+        - enemy: Instance of the Enemy class.
+        """
+        return int(self.tick - self.last_decision[enemy.slot])
+
+    def decide(self, slot, status, direction, current_time):
+        """
+        Apply an AI decision to the enemy in a slot.
+
+        Parameters:
+        - slot: Slot of the enemy.
+        - status: The new status code of the enemy.
+        - direction: The unit direction a chasing enemy moves in.
+        - current_time: Integer with the current time in milliseconds.
+        """
+        enemy = self.enemies[slot]
+        if status != self.status[slot]:
+            self.status[slot] = status
+            enemy.set_status(STATUS_NAMES[status])
+            if status == IDLE:
+                enemy.direction.update(0, 0)
+
+        if status == ATTACK:
+            enemy.attack(current_time)
+        elif status == MOVE:
+            enemy.direction.update(direction[0], direction[1])
+        self.last_decision[slot] = self.tick
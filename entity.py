@@ -1,4 +1,5 @@
 import pygame
+from spatial_hash import SpatialHash
 
 class Entity(pygame.sprite.Sprite):
     """
@@ -11,17 +12,32 @@ class Entity(pygame.sprite.Sprite):
     - frame_index: Index representing the current frame in the entity's animation.
     - animation_speed: Speed at which the entity's animation cycles through frames.
     - direction: Vector representing the entity's movement direction.
+    - steering: Vector added to the direction when moving, e.g. to keep
+    enemies apart.
+    - movement: Vector of the unit movement of the last move, whose signs
+    decide how collisions are resolved.
+
+    Class attributes:
+    - corner_tolerance: Number of pixels by which the entity is shifted
+    sideways past the corner of an obstacle it clips, instead of stopping.
+    0 disables sliding.
 
     Methods:
     - move(speed): Move the entity in the current direction with the specified speed.
     - collision(direction): Handle collision detection and response in the specified direction.
+    - slide(obstacle, axis): Shift the entity past the corner of an obstacle.
+    - relocate(): Update the entity in the spatial hashes containing it.
     """
+    corner_tolerance = 0
+
     def __init__(self, groups):
         """Initialize the entity with the given groups."""
         super().__init__(groups)
         self.frame_index = 0
         self.animation_speed = 0.15
         self.direction = pygame.math.Vector2()
+        self.steering = pygame.math.Vector2()
+        self.movement = pygame.math.Vector2()
 
     def move(self, speed):
         """
@@ -32,32 +48,83 @@ class Entity(pygame.sprite.Sprite):
         """
         if self.direction.magnitude() != 0:
             self.direction = self.direction.normalize()
-        
-        self.hitbox.x += self.direction.x * speed
-        self.collision("horizontal")
-        self.hitbox.y += self.direction.y * speed
-        self.collision("vertical")
+
+        # the steering bends the movement, the sum is capped at unit length so it never exceeds the speed
+        movement = self.direction + self.steering
+        if movement.magnitude() > 1:
+            movement = movement.normalize()
+        self.movement = movement
+
+        # standing entities cannot collide, so the collision tests are skipped
+        if movement.magnitude() != 0:
+            self.hitbox.x += movement.x * speed
+            self.collision("horizontal")
+            self.hitbox.y += movement.y * speed
+            self.collision("vertical")
         self.rect.center = self.hitbox.center
 
     def collision(self, direction):
         """
         Handle collision detection and response in the specified direction.
+        Only the obstacles in the grid cells overlapped by the hitbox are tested.
 
         Parameters:
         - direction(str): The direction of collision detection and response ("horizontal" or "vertical").
         """
         if direction == "horizontal":
-            for sprite in self.obstacle_sprites:
+            for sprite in self.obstacle_grid.query(self.hitbox):
                 if sprite.hitbox.colliderect(self.hitbox):
-                    if self.direction.x > 0:
+                    if self.slide(sprite.hitbox, "vertical"):
+                        continue
+                    if self.movement.x > 0:
                         self.hitbox.right = sprite.hitbox.left
-                    if self.direction.x < 0:
+                    if self.movement.x < 0:
                         self.hitbox.left = sprite.hitbox.right
 
         if direction == "vertical":
-            for sprite in self.obstacle_sprites:
+            for sprite in self.obstacle_grid.query(self.hitbox):
                 if sprite.hitbox.colliderect(self.hitbox):
-                    if self.direction.y > 0:
+                    if self.slide(sprite.hitbox, "horizontal"):
+                        continue
+                    if self.movement.y > 0:
                         self.hitbox.bottom = sprite.hitbox.top 
-                    if self.direction.y < 0:
-                        self.hitbox.top = sprite.hitbox.bottom
\ No newline at end of file
+                    if self.movement.y < 0:
+                        self.hitbox.top = sprite.hitbox.bottom
+
+    def slide(self, obstacle, axis):
+        """
+        Shift the hitbox along an axis out of an obstacle whose corner it
+        only clips by at most corner_tolerance pixels, if the shifted hitbox
+        is free. Lets entities as wide as a tile pass through one tile wide
+        gaps without being perfectly aligned.
+
+        Parameters:
+        - obstacle: The hitbox of the obstacle.
+        - axis: The axis of the shift ("horizontal" or "vertical").
+
+        Returns:
+        - True if the hitbox was shifted, False if the collision has to be resolved.
+        """
+        if not self.corner_tolerance:
+            return False
+        if axis == "horizontal":
+            before = self.hitbox.right - obstacle.left
+            after = obstacle.right - self.hitbox.left
+            shifted = self.hitbox.move(-before if before <= after else after, 0)
+        else:
+            before = self.hitbox.bottom - obstacle.top
+            after = obstacle.bottom - self.hitbox.top
+            shifted = self.hitbox.move(0, -before if before <= after else after)
+        if min(before, after) > self.corner_tolerance:
+            return False
+        for sprite in self.obstacle_grid.query(shifted):
+            if sprite.hitbox.colliderect(shifted):
+                return False
+        self.hitbox.topleft = shifted.topleft
+        return True
+
+    def relocate(self):
+        """Update the cells of the entity in the spatial hashes containing it, after it moved."""
+        for group in self.groups():
+            if isinstance(group, SpatialHash):
+                group.relocate(self)
@@ -0,0 +1,134 @@
+import pygame
+from collections import OrderedDict
+from settings import *
+from level_compiler import compile_floor, floor_chunk_path, floor_path
+
+
+class ChunkedFloor:
+    """
+    Floor image of a level split into square chunks, of which only the
+    recently seen ones are kept in memory.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+    - width: Width of the map in pixels.
+    - height: Height of the map in pixels.
+    - chunk_size: Size of a chunk in pixels.
+    - capacity: Maximum number of resident chunks.
+
+    Attributes:
+    - map_number: Integer representing the index of the level map.
+    - rect: Rect of the whole floor in world coordinates.
+    - chunk_size: Size of a chunk in pixels.
+    - capacity: Maximum number of resident chunks.
+    - chunks: Ordered dictionary mapping (column, row) to the loaded chunk
+    surfaces, least recently used first.
+    - on_disk: Boolean indicating whether the chunks are loaded from the
+    compiled cache, or sliced from the whole floor image kept in memory.
+    - source_surf: The whole floor image, only loaded when the chunks
+    could not be written to disk.
+    - loads: Number of chunks loaded since the floor was created.
+
+    Methods:
+    - chunk_range(rect): Return the column and row ranges of the chunks covering a rect.
+    - get_chunk(col, row): Return a chunk surface, loading it if it is not resident.
+    - adopt(chunks): Convert and keep chunks that were decoded by a background loader.
+    - draw(surface, viewport): Blit the chunks intersecting the viewport.
+    - release(): Drop all resident chunks.
+    """
+    def __init__(self, map_number, width, height, chunk_size = FLOOR_CHUNK_SIZE, capacity = FLOOR_CHUNK_CAPACITY):
+        """
+        Initialize the chunked floor, compiling the chunks if needed.
+        """
+        self.map_number = map_number
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.chunk_size = chunk_size
+        self.capacity = capacity
+        self.chunks = OrderedDict()
+        self.on_disk = compile_floor(map_number, chunk_size)
+        self.source_surf = None
+        self.loads = 0
+
+    def chunk_range(self, rect):
+        """
+        Return the column and row ranges of the chunks covering a rect.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - Tuple of two range objects (columns, rows).
+        """
+        rect = rect.clip(self.rect)
+        size = self.chunk_size
+        if not rect.width or not rect.height:
+            return range(0), range(0)
+        columns = range(rect.left // size, (rect.right - 1) // size + 1)
+        rows = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return columns, rows
+
+    def get_chunk(self, col, row):
+        """
+        Return a chunk surface, loading it if it is not resident and
+        evicting the least recently used chunks beyond the capacity.
+
+        Parameters:
+        - col: Column of the chunk.
+        - row: Row of the chunk.
+
+        Returns:
+        - The converted chunk surface.
+        """
+        key = (col, row)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        if self.on_disk:
+            chunk = pygame.image.load(floor_chunk_path(self.map_number, col, row)).convert()
+        else:
+            if self.source_surf is None:
+                self.source_surf = pygame.image.load(floor_path(self.map_number)).convert()
+            size = self.chunk_size
+            chunk = self.source_surf.subsurface(pygame.Rect(col * size, row * size, size, size).clip(self.rect))
+        self.loads += 1
+        self.store(key, chunk)
+        return chunk
+
+    def store(self, key, chunk):
+        """Keep a chunk resident, evicting the least recently used ones."""
+        self.chunks[key] = chunk
+        self.chunks.move_to_end(key)
+        while len(self.chunks) > self.capacity:
+            self.chunks.popitem(last = False)
+
+    def adopt(self, chunks):
+        """
+        Convert and keep chunks that were decoded by a background loader.
+
+        Parameters:
+        - chunks: Dictionary mapping (column, row) to decoded chunk surfaces.
+        """
+        for key, chunk in chunks.items():
+            if key not in self.chunks:
+                self.store(key, chunk.convert())
+
+    def draw(self, surface, viewport):
+        """
+        Blit the chunks intersecting the viewport onto the surface.
+
+        Parameters:
+        - surface: The display surface.
+        - viewport: Rect of the world area seen by the camera.
+        """
+        size = self.chunk_size
+        columns, rows = self.chunk_range(viewport)
+        surface.blits(
+            [(self.get_chunk(col, row), (col * size - viewport.x, row * size - viewport.y)) for row in rows for col in columns],
+            doreturn = False)
+
+    def release(self):
+        """Drop all resident chunks."""
+        self.chunks.clear()
+        self.source_surf = None
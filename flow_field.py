@@ -0,0 +1,193 @@
+import numpy as np
+from settings import *
+
+# (column, row) offsets of the four neighbours of a tile
+NEIGHBOURS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)])
+
+
+class FlowField:
+    """
+    Distance map from the tile of the player over the walkable tiles of
+    a level, shared by all chasing enemies as a per-tile lookup of the
+    next tile on a shortest path around the walls.
+
+    The map is rebuilt with a breadth-first search whenever the player
+    enters a new tile while enemies are chasing. The search expands its
+    whole wavefront at once with array operations, stops at a path length
+    of FLOW_FIELD_RADIUS tiles and is spread over several simulation steps,
+    at most FLOW_FIELD_WAVES waves per step; the last complete map stays in
+    use until the new one is finished. The cost is therefore independent
+    of the number of chasing enemies, which only do an array lookup.
+
+    Parameters:
+    - columns: Number of tile columns of the level.
+    - rows: Number of tile rows of the level.
+
+    Attributes:
+    - walkable: Array of flags telling whether a tile can be walked on.
+    - target: (column, row) of the tile the current map leads to, or None.
+    - distance: Array of the path lengths in tiles to the target, -1 for
+    tiles that cannot reach it.
+    - next_tile: Array of the (column, row) of the next tile on the path
+    from every tile.
+    - pending_target: (column, row) of the tile of the map being built, or None.
+    - pending_distance: Array of the distances of the map being built.
+    - frontier: Array of flags marking the last wave of the map being built.
+    - depth: Distance of the last wave of the map being built.
+    - builds: Number of maps finished so far.
+
+    Methods:
+    - add_obstacles(sprites): Mark the tiles covered by obstacles as not walkable.
+    - update(position): Follow the player and continue building the map.
+    - start(tile): Start building a map towards a tile.
+    - expand(waves): Expand the map being built by a number of waves.
+    - finish(): Derive the next tiles of the built map and put it in use.
+    - directions(positions, fallback): Return the directions to follow from positions.
+    """
+    def __init__(self, columns, rows):
+        """
+        Initialize a flow field over an empty grid without a target.
+
+        Parameters:
+        - columns: Number of tile columns of the level.
+        - rows: Number of tile rows of the level.
+        """
+        self.walkable = np.ones((rows, columns), dtype = bool)
+        self.target = None
+        self.distance = np.full((rows, columns), -1, dtype = np.int32)
+        self.next_tile = np.zeros((rows, columns, 2), dtype = np.int32)
+        self.pending_target = None
+        self.pending_distance = None
+        self.frontier = None
+        self.depth = 0
+        self.builds = 0
+
+    def add_obstacles(self, sprites):
+        """
+        Mark the tiles whose center lies in the hitbox of an obstacle as not walkable.
+
+        Parameters:
+        - sprites: Iterable of obstacle sprites with a hitbox.
+        """
+        rows, columns = self.walkable.shape
+        for sprite in sprites:
+            hitbox = sprite.hitbox
+            # tiles whose center lies in [left, right) and [top, bottom)
+            first_col = max((hitbox.left - TILESIZE // 2 + TILESIZE - 1) // TILESIZE, 0)
+            last_col = min((hitbox.right - TILESIZE // 2 - 1) // TILESIZE, columns - 1)
+            first_row = max((hitbox.top - TILESIZE // 2 + TILESIZE - 1) // TILESIZE, 0)
+            last_row = min((hitbox.bottom - TILESIZE // 2 - 1) // TILESIZE, rows - 1)
+            if first_col <= last_col and first_row <= last_row:
+                self.walkable[first_row:last_row + 1, first_col:last_col + 1] = False
+
+    def update(self, position):
+        """
+        Start a new map when the player entered another tile and continue
+        building the pending map.
+
+        Parameters:
+        - position: Center of the player in world coordinates.
+        """
+        rows, columns = self.walkable.shape
+        tile = (min(max(int(position[0]) // TILESIZE, 0), columns - 1),
+                min(max(int(position[1]) // TILESIZE, 0), rows - 1))
+        if tile != self.target and tile != self.pending_target:
+            self.start(tile)
+        if self.pending_target is not None:
+            self.expand(FLOW_FIELD_WAVES)
+
+    def start(self, tile):
+        """
+        Start building a map towards a tile, replacing a map still being built.
+
+        Parameters:
+        - tile: (column, row) of the target tile.
+        """
+        self.pending_target = tile
+        self.pending_distance = np.full(self.walkable.shape, -1, dtype = np.int32)
+        self.pending_distance[tile[1], tile[0]] = 0
+        self.frontier = np.zeros(self.walkable.shape, dtype = bool)
+        self.frontier[tile[1], tile[0]] = True
+        self.depth = 0
+
+    def expand(self, waves):
+        """
+        Expand the map being built by a number of breadth-first waves,
+        finishing it when no walkable tile is left to reach within
+        FLOW_FIELD_RADIUS tiles.
+
+        Parameters:
+        - waves: Maximum number of waves.
+        """
+        distance = self.pending_distance
+        walkable = self.walkable
+        for _ in range(waves):
+            frontier = self.frontier
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown &= walkable & (distance < 0)
+            if not grown.any():
+                self.finish()
+                return
+            self.depth += 1
+            distance[grown] = self.depth
+            self.frontier = grown
+            if self.depth == FLOW_FIELD_RADIUS:
+                self.finish()
+                return
+
+    def finish(self):
+        """
+        Point every reached tile to its neighbour closest to the target
+        and put the built map in use.
+        """
+        distance = self.pending_distance
+        rows, columns = distance.shape
+        # unreached tiles and tiles outside the grid are never chosen as next tile
+        padded = np.full((rows + 2, columns + 2), np.iinfo(np.int32).max, dtype = np.int32)
+        padded[1:-1, 1:-1] = np.where(distance >= 0, distance, np.iinfo(np.int32).max)
+        candidates = np.stack([padded[1 + row:1 + row + rows, 1 + col:1 + col + columns] for col, row in NEIGHBOURS])
+        best = NEIGHBOURS[candidates.argmin(axis = 0)]
+
+        grid_rows, grid_columns = np.indices(distance.shape)
+        self.next_tile = np.stack((grid_columns, grid_rows), axis = -1) + best
+        self.distance = distance
+        self.target = self.pending_target
+        self.pending_target = None
+        self.pending_distance = None
+        self.frontier = None
+        self.builds += 1
+
+    def directions(self, positions, fallback):
+        """
+        Return the unit directions from positions towards the center of the
+        next tile on the path to the target. Positions on the target tile or
+        next to it, and positions without a path, keep their fallback direction.
+
+        Parameters:
+        - positions: Array of (x, y) positions in world coordinates.
+        - fallback: Array of the directions used where the map does not help,
+        usually the straight directions to the player.
+
+        Returns:
+        - Array of unit directions.
+        """
+        if self.target is None or not len(positions):
+            return fallback
+        rows, columns = self.distance.shape
+        tile_cols = positions[:, 0].astype(np.int32) // TILESIZE
+        tile_rows = positions[:, 1].astype(np.int32) // TILESIZE
+        inside = (tile_cols >= 0) & (tile_cols < columns) & (tile_rows >= 0) & (tile_rows < rows)
+        tile_cols = np.where(inside, tile_cols, 0)
+        tile_rows = np.where(inside, tile_rows, 0)
+
+        use_path = inside & (self.distance[tile_rows, tile_cols] > 1)
+        next_center = (self.next_tile[tile_rows, tile_cols] + 0.5) * TILESIZE
+        delta = next_center - positions
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        use_path &= length > 0
+        path = delta / np.where(length > 0, length, 1)[:, None]
+        return np.where(use_path[:, None], path, fallback)
@@ -0,0 +1,93 @@
+from settings import *
+
+
+class OccupancyGrid:
+    """
+    Spatial index of the static obstacles of a level, bucketed by tile cell.
+
+    Every obstacle is registered in each cell its hitbox overlaps, so a
+    collision test only has to look at the few cells covered by the moving
+    hitbox instead of scanning every obstacle on the map.
+
+    Parameters:
+    - cell_size: Size of a grid cell in pixels. Defaults to TILESIZE.
+
+    Attributes:
+    - cell_size: Size of a grid cell in pixels.
+    - cells: Dictionary mapping (column, row) tuples to the list of
+    obstacle sprites overlapping that cell.
+    - queries: Number of queries since the counters were last reset.
+    - tests: Number of obstacles returned for collision tests since the
+    counters were last reset.
+
+    Methods:
+    - add(sprite): Register an obstacle sprite in every cell its hitbox covers.
+    - cell_range(rect): Return the column and row ranges covered by a rect.
+    - query(rect): Return the obstacles in the cells covered by a rect.
+    - reset_counters(): Reset the query and test counters.
+    """
+    def __init__(self, cell_size = TILESIZE):
+        """
+        Initialize an empty occupancy grid.
+
+        Parameters:
+        - cell_size: Size of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.queries = 0
+        self.tests = 0
+
+    def cell_range(self, rect):
+        """
+        Return the column and row ranges covered by a rect.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - Tuple of two range objects (columns, rows).
+        """
+        size = self.cell_size
+        columns = range(rect.left // size, (rect.right - 1) // size + 1)
+        rows = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return columns, rows
+
+    def add(self, sprite):
+        """
+        Register an obstacle sprite in every cell its hitbox covers.
+
+        Parameters:
+        - sprite: Sprite with a hitbox attribute.
+        """
+        columns, rows = self.cell_range(sprite.hitbox)
+        for row in rows:
+            for col in columns:
+                self.cells.setdefault((col, row), []).append(sprite)
+
+    def query(self, rect):
+        """
+        Return the obstacles in the cells covered by a rect.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates, usually a moving hitbox.
+
+        Returns:
+        - List of obstacle sprites, each listed once.
+        """
+        columns, rows = self.cell_range(rect)
+        cells = self.cells
+        found = {}
+        for row in rows:
+            for col in columns:
+                for sprite in cells.get((col, row), ()):
+                    found[sprite] = None
+        self.queries += 1
+        self.tests += len(found)
+        return list(found)
+
+    def reset_counters(self):
+        """Reset the query and test counters."""
+        self.queries = 0
+        self.tests = 0
+
@@ -20,9 +20,127 @@ def import_csv_layout(path):
             terrain_map.append(list(row))
     return terrain_map
 
+class AssetCache:
+    """
+    Process-wide cache of loaded and converted image surfaces.
+
+    Every image file is decoded and converted only once, and all callers
+    share the same surface (for example, every enemy of a type uses the same
+    animation frames). Folders are cached as shared lists of those surfaces,
+    which must not be modified by the caller.
+
+    Attributes:
+    - surfaces: Dictionary mapping (path, alpha) to the converted surface.
+    - folders: Dictionary mapping a folder path to its list of surfaces.
+    - hits: Number of image requests served from the cache.
+    - misses: Number of image requests that had to load the file.
+
+    Methods:
+    - image(path, alpha): Return the converted surface of an image file.
+    - folder(path): Return the surfaces of all images in a folder.
+    - evict(prefix): Drop the cached surfaces whose path starts with prefix.
+    - clear(): Drop every cached surface and reset the counters.
+    - stats(): Return the counters and the number of cached surfaces.
+    """
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.surfaces = {}
+        self.folders = {}
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, alpha = True):
+        """
+        Return the converted surface of an image file, loading it on first use.
+
+        Parameters:
+        - path (str): The file path of the image.
+        - alpha (bool): Whether to keep per-pixel alpha (convert_alpha) or
+        convert to the display format without it.
+
+        Returns:
+        - surface: The shared Pygame surface.
+        """
+        key = (path, alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            self.surfaces[key] = surface
+        else:
+            self.hits += 1
+        return surface
+
+    def folder(self, path):
+        """
+        Return the surfaces of all images in a folder.
+
+        Parameters:
+        - path (str): The folder path containing the images.
+
+        Returns:
+        - surface_list (list): The shared list of Pygame surfaces.
+        """
+        surface_list = self.folders.get(path)
+        if surface_list is None:
+            surface_list = []
+            #returns the filepath, list of folders and list of files - need the files
+            for _, __, img_files in walk(path):
+                for image in img_files:
+                    surface_list.append(self.image(path + '/' + image))
+            self.folders[path] = surface_list
+        else:
+            self.hits += len(surface_list)
+        return surface_list
+
+    def evict(self, prefix):
+        """
+        Drop the cached surfaces and folders whose path starts with prefix.
+
+        Parameters:
+        - prefix (str): Path prefix, e.g. "assets/enemies/squid".
+        """
+        self.surfaces = {key: surface for key, surface in self.surfaces.items() if not key[0].startswith(prefix)}
+        self.folders = {path: surfaces for path, surfaces in self.folders.items() if not path.startswith(prefix)}
+
+    def clear(self):
+        """Drop every cached surface and reset the counters."""
+        self.surfaces.clear()
+        self.folders.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Return the counters and the number of cached surfaces.
+
+        Returns:
+        - Dictionary with hits, misses and surfaces.
+        """
+        return {"hits" : self.hits, "misses" : self.misses, "surfaces" : len(self.surfaces)}
+
+
+asset_cache = AssetCache()
+
+def import_image(path, alpha = True):
+    """
+    Import an image through the shared asset cache.
+
+    Parameters:
+    - path (str): The file path of the image.
+    - alpha (bool): Whether the surface keeps per-pixel alpha.
+
+    Returns:
+    - surface: The shared, converted Pygame surface.
+    """
+    return asset_cache.image(path, alpha)
+
 def import_folder(path):
     """
     Import a folder containing images and return a list of surfaces.
+    The surfaces come from the shared asset cache, so the list must
+    not be modified.
 
     Parameters:
     - path (str): The folder path containing the images.
@@ -30,11 +148,4 @@ def import_folder(path):
     Returns:
     - surface_list (list): A list of Pygame surfaces.
     """
-    surface_list = []
-    #returns the filepath, list of folders and list of files - need the files
-    for _, __, img_files in walk(path):
-        for image in img_files:
-            full_path = path + '/' + image
-            image_surf = pygame.image.load(full_path).convert_alpha()
-            surface_list.append(image_surf)
-    return surface_list
\ No newline at end of file
+    return asset_cache.folder(path)
@@ -1,12 +1,27 @@
 import pygame
 from settings import *
 
+# (label, profiler phase) pairs listed by the performance overlay
+OVERLAY_PHASES = (
+    ("draw", "custom_draw"),
+    ("particles", "particles"),
+    ("sprites", "update"),
+    ("enemy AI", "enemy_update"),
+    ("attacks", "player_attack"),
+    ("transitions", "check_map_transition"),
+    ("hud", "hud")
+)
+
 
 class HUD:
     """
     Represent the heads-up display (HUD) of the game,
     displaying player health, energy, and experience.
 
+    Every HUD element is rendered into a cached panel surface
+    that is only re-rendered when the value it shows changes,
+    and all panels are drawn with a single blits call.
+
     Attributes:
     - display_surface: A Pygame surface representing
     the display window.
@@ -15,15 +30,28 @@ class HUD:
     bounding rectangle of the health bar.
     - energy_bar_rect: A Pygame Rect representing the
     bounding rectangle of the energy bar.
+    - panels: Dictionary mapping a panel name to a tuple
+    (key, surface, position) of its last rendering, where
+    key is the value the panel was rendered for.
+    - overlay_font: A smaller Pygame font object for the
+    performance overlay.
+    - overlay_bg: Translucent background surface of the
+    performance overlay, created on first use.
 
     Methods:
     - __init__(self): Initializes the HUD with the display
     surface and font.
-    - show_bar(self, current, max_amount, bg_rect, color): 
-    Displays a bar representing a resource (health or energy).
-    - show_exp(self, exp): Displays the player's experience points.
+    - panel(self, name, key, render): Returns the cached panel
+    for a value, rendering it again if the value changed.
+    - bar_width(self, current, max_amount, bg_rect): Returns the
+    filled width of a bar in pixels.
+    - render_bar(self, width, bg_rect, color): Renders a bar
+    representing a resource (health or energy).
+    - render_exp(self, exp): Renders the player's experience points.
     - display(self, player): Displays the HUD elements including health,
     energy, and experience.
+    - show_overlay(self, level, profiler): Displays the performance
+    overlay with the frame rate, frame-time graph, phase timings and counts.
     """
     def __init__(self):
         """
@@ -34,42 +62,87 @@ class HUD:
 
         self.health_bar_rect = pygame.Rect(10, 10, HEALTH_BAR_WIDTH, BAR_HEIGHT)
         self.energy_bar_rect = pygame.Rect(10, 34, ENERGY_BAR_WIDTH, BAR_HEIGHT)
+        self.panels = {}
+
+        self.overlay_font = pygame.font.Font(UI_FONT, PERF_FONT_SIZE)
+        self.overlay_bg = None
+
+    def panel(self, name, key, render):
+        """
+        Return the cached panel for a value, rendering it again
+        only if the value changed since the last call.
+
+        Parameters:
+        - name: Name of the panel.
+        - key: The value shown by the panel, compared to the cached one.
+        - render: Function without arguments returning the rendered
+        (surface, position) of the panel.
+
+        Returns:
+        - Tuple (surface, position) ready for blitting.
+        """
+        cached = self.panels.get(name)
+        if cached is None or cached[0] != key:
+            surface, position = render()
+            cached = self.panels[name] = (key, surface, position)
+        return cached[1], cached[2]
 
-    def show_bar(self, current, max_amount, bg_rect, color):
+    def bar_width(self, current, max_amount, bg_rect):
         """
-        Display a bar representing a resource (health or energy).
+        Return the filled width of a bar in whole pixels, so a slowly
+        regenerating resource only changes the bar when a pixel changes.
 
         Parameters:
         - current: Current amount of the resource.
         - max_amount: Maximum amount of the resource.
         - bg_rect: Pygame Rect representing the bounding rectangle of the bar.
+        """
+        ratio = current / max_amount
+        return max(0, min(bg_rect.width, int(bg_rect.width * ratio)))
+
+    def render_bar(self, width, bg_rect, color):
+        """
+        Render a bar representing a resource (health or energy).
+
+        Parameters:
+        - width: Filled width of the bar in pixels.
+        - bg_rect: Pygame Rect representing the bounding rectangle of the bar.
         - color: Color of the bar representing the resource.
+
+        Returns:
+        - Tuple (surface, position) of the bar.
         """
-        pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_rect)
+        surface = pygame.Surface(bg_rect.size)
+        surface.fill(UI_BG_COLOR)
+        local_rect = surface.get_rect()
 
-        ratio = current / max_amount
-        current_width = bg_rect.width * ratio
-        current_rect = bg_rect.copy()
-        current_rect.width = current_width
-
-        pygame.draw.rect(self.display_surface, color, current_rect)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_rect, 3)
-        
-    def show_exp(self, exp):
+        current_rect = local_rect.copy()
+        current_rect.width = width
+
+        pygame.draw.rect(surface, color, current_rect)
+        pygame.draw.rect(surface, UI_BORDER_COLOR, local_rect, 3)
+        return surface, bg_rect.topleft
+
+    def render_exp(self, exp):
         """
-        Display the player's experience points.
+        Render the player's experience points.
 
         Parameters:
         - exp: Integer representing the player's experience points.
+
+        Returns:
+        - Tuple (surface, position) of the experience box.
         """
-        text_surf = self.font.render(str(int(exp)), False, TEXT_COLOR)
+        text_surf = self.font.render(str(exp), False, TEXT_COLOR)
         x = self.display_surface.get_size()[0] - 20
         y = self.display_surface.get_size()[1] - 20
-        text_rect = text_surf.get_rect(bottomright = (x,y))
-        
-        pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(20,20))
-        self.display_surface.blit(text_surf, text_rect)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, text_rect.inflate(20,20), 3)
+        box_rect = text_surf.get_rect(bottomright = (x,y)).inflate(20,20)
+
+        surface = pygame.Surface(box_rect.size)
+        surface.fill(UI_BG_COLOR)
+        surface.blit(text_surf, (10, 10))
+        pygame.draw.rect(surface, UI_BORDER_COLOR, surface.get_rect(), 3)
+        return surface, box_rect.topleft
 
     def display(self, player):
         """
@@ -78,7 +151,79 @@ class HUD:
         Parameters:
         - player: Instance of the Player class representing the player character.
         """
-        self.show_bar(player.health, player.stats["health"], self.health_bar_rect, HEALTH_COLOR)
-        self.show_bar(player.energy, player.stats["energy"], self.energy_bar_rect, ENERGY_COLOR)
+        health = self.bar_width(player.health, player.stats["health"], self.health_bar_rect)
+        energy = self.bar_width(player.energy, player.stats["energy"], self.energy_bar_rect)
+        exp = int(player.exp)
+
+        self.display_surface.blits((
+            self.panel("health", health, lambda: self.render_bar(health, self.health_bar_rect, HEALTH_COLOR)),
+            self.panel("energy", energy, lambda: self.render_bar(energy, self.energy_bar_rect, ENERGY_COLOR)),
+            self.panel("exp", exp, lambda: self.render_exp(exp))
+        ), doreturn = False)
+
+    def show_overlay(self, level, profiler):
+        """
+        Display the performance overlay: the frame rate, a graph of the recent
+        frame times, the time of each phase of the last frame and its average,
+        and the number of sprites, enemies, particles, obstacle tests, hit
+        candidates and line of sight traces.
+
+        Parameters:
+        - level: Instance of the Level class being played.
+        - profiler: Instance of FrameProfiler holding the recent frames.
+        """
+        frame_times = [seconds * 1000 for seconds in profiler.samples("frame")]
+        average = sum(frame_times) / len(frame_times) if frame_times else 0
+        fps = 1000 / average if average else 0
+        lines = [f"FPS {fps:5.1f}   frame {frame_times[-1] if frame_times else 0:5.1f} ms"
+                 f"   max {max(frame_times, default = 0):5.1f} ms"]
+
+        for label, phase in OVERLAY_PHASES:
+            samples = profiler.samples(phase)
+            last = samples[-1] * 1000 if samples else 0
+            mean = sum(samples) * 1000 / len(samples) if samples else 0
+            lines.append(f"{label:<12}{last:6.2f} ms   avg {mean:6.2f} ms")
+
+        sprites = level.visible_sprites
+        manager = level.enemy_manager
+        grid = level.obstacle_grid
+        targets = level.damageable_sprites
+        sight = level.line_of_sight
+        particles = level.world.animation_player
+        tiers = "/".join(str(count) for count in manager.tier_counts.values())
+        lines.append(f"sprites {len(sprites)}   drawn {sprites.drawn_count}")
+        lines.append(f"enemies {len(manager)}   full/reduced/dormant {tiers}")
+        lines.append(f"particles {len(particles)}/{particles.capacity}   dropped {particles.dropped}")
+        lines.append(f"obstacle tests {grid.tests} in {grid.queries} queries")
+        lines.append(f"hit candidates {targets.candidates} in {targets.queries} queries")
+        lines.append(f"sight traces {sight.traces} in {sight.queries} queries")
+        grid.reset_counters()
+        targets.reset_counters()
+        sight.reset_counters()
+
+        line_height = self.overlay_font.get_linesize()
+        height = len(lines) * line_height + PERF_GRAPH_HEIGHT + 20
+        if self.overlay_bg is None or self.overlay_bg.get_height() != height:
+            self.overlay_bg = pygame.Surface((PERF_OVERLAY_WIDTH, height))
+            self.overlay_bg.set_alpha(180)
+            self.overlay_bg.fill(UI_BG_COLOR)
+
+        left = self.display_surface.get_size()[0] - PERF_OVERLAY_WIDTH - 10
+        top = 10
+        blit_list = [(self.overlay_bg, (left, top))]
+        for index, line in enumerate(lines):
+            blit_list.append((self.overlay_font.render(line, False, TEXT_COLOR), (left + 5, top + 5 + index * line_height)))
+        self.display_surface.blits(blit_list, doreturn = False)
 
-        self.show_exp(player.exp)
\ No newline at end of file
+        # frame-time graph with the frame budget as reference line
+        graph = pygame.Rect(left + 5, top + 10 + len(lines) * line_height, PERF_OVERLAY_WIDTH - 10, PERF_GRAPH_HEIGHT)
+        scale = graph.height / PERF_GRAPH_MAX_MS
+        budget_y = graph.bottom - min(1000 / FPS, PERF_GRAPH_MAX_MS) * scale
+        pygame.draw.line(self.display_surface, UI_BORDER_COLOR_ACTIVE, (graph.left, budget_y), (graph.right, budget_y))
+        if len(frame_times) > 1:
+            step = graph.width / (PERF_HISTORY - 1)
+            start = graph.right - (len(frame_times) - 1) * step
+            points = [(start + index * step, graph.bottom - min(ms, PERF_GRAPH_MAX_MS) * scale)
+                      for index, ms in enumerate(frame_times)]
+            pygame.draw.lines(self.display_surface, TEXT_COLOR, False, points)
+        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, graph, 1)
@@ -1,14 +1,29 @@
 import pygame
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from collections import OrderedDict
 from settings import *
 from tile import Tile
 from player import Player
 from helpers import *
-from weapon import Weapon
+from weapon import WeaponPool
 from enemy import Enemy
 from minigame import MiniGame
 from hud import HUD
 from magic import Magic
 from particles import AnimationPlayer
+from grid import OccupancyGrid
+from spatial_hash import SpatialHash
+from flow_field import FlowField
+from line_of_sight import LineOfSight
+from level_compiler import load_level
+from prefetch import LevelPrefetcher
+from floor import ChunkedFloor
+from enemy_manager import EnemyManager
+from controls import KeyboardInput
+from profiler import FrameProfiler
+from scenes import SceneStack, OverlayScene
+from timers import TimerScheduler
 
 class World:
     """
@@ -20,34 +35,69 @@ class World:
     - from_map: Integer representing the index of the previous map.
     - changed_map: Boolean indicating whether the map has been changed.
     - level: Instance of the Level class representing the current game level.
+    - levels: Ordered dictionary of recently visited Level instances by map
+    number, least recently used first, holding at most LEVEL_CACHE_SIZE levels.
     - current_attack: Current attack instance being used by the player.
+    - weapon_pool: Instance of WeaponPool handing out the preloaded weapon sprites.
     - player: Instance of the Player class, representing the player character.
     - current_mini_game: Instance of the MiniGame class representing the current mini-game being played.
     - mini_game_active: Boolean indicating whether a mini-game is currently active.
     - solved_mini_game: Boolean indicating whether the current mini-game has been solved correctly.
     - game_correct_answers: Integer representing the number of correct answers in the current mini-game.
-    - animation_player: Instance of AnimationPlayer for handling magic attack animations.
+    - animation_player: Instance of AnimationPlayer, the particle pool of the
+    spells and enemy attack effects of the current level.
     - magic: Instance of Magic for handling player magic abilities.
+    - prefetcher: Instance of LevelPrefetcher reading the maps linked from
+    the current level in the background.
+    - loading_font: Pygame font used for the loading indicator.
+    - controls: The input source of the player, the keyboard unless a
+    scripted input is given.
+    - profiler: Instance of FrameProfiler timing the phases of the levels,
+    disabled unless a benchmark or the performance overlay enables it.
+    - overlay_active: Boolean indicating whether the performance overlay is shown.
+    - overlay: The OverlayScene showing the performance overlay.
+    - scenes: The SceneStack driven by the main loop, onto which the
+    mini-games and the overlay are pushed.
+    - timers: The TimerScheduler of the world on simulation time, advanced by
+    the WorldScene only, so cooldowns and invincibility windows do not run
+    out while a modal mini-game pauses the world.
     """
-    def __init__(self):
+    def __init__(self, controls = None, scenes = None):
         """
         Initialize the World object by setting up the display surface, position, level, player, and game state.
+
+        Parameters:
+        - controls: The input source of the player, defaults to KeyboardInput.
+        - scenes: The SceneStack of the game, a new one by default.
         """
         self.display_surface = pygame.display.get_surface()
+        self.controls = controls or KeyboardInput()
+        self.profiler = FrameProfiler(history = PERF_HISTORY)
+        self.overlay_active = False
+        self.overlay = OverlayScene(self)
+        self.scenes = scenes if scenes is not None else SceneStack()
+        self.timers = TimerScheduler()
 
         self.position = (0,0)
         self.from_map = 0
         self.changed_map = False
+        self.levels = OrderedDict()
+        self.prefetcher = LevelPrefetcher()
+        self.loading_font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
         self.level = Level(0, self)
+        self.prefetch_neighbours()
 
         self.current_attack = None
+        self.weapon_pool = WeaponPool()
 
         self.player = Player(self.position, 
                             [self.level.visible_sprites], 
-                            self.level.obstacle_sprites,
+                            self.level.obstacle_grid,
                             self.create_physical_attack,
                             self.destroy_physical_attack,
-                            self.create_magic)
+                            self.create_magic,
+                            self.controls,
+                            self.timers)
         
         self.current_mini_game = None
         self.mini_game_active = False
@@ -57,42 +107,123 @@ class World:
         self.animation_player = AnimationPlayer()
         self.magic = Magic(self.animation_player)
 
-    def change_map(self, map_number):
+    def change_map(self, map_number, reset = False):
         """
         Changes the current map to the specified map number.
 
         Parameters:
         - map_number: Integer representing the index of the next map.
+        - reset: Boolean indicating whether the next map is rebuilt from
+        scratch instead of reused from the cache of visited levels.
         """
         self.player.remove(self.level.visible_sprites)
-        del self.level
+        self.animation_player.clear()
+        self.cache_level(self.level)
         self.changed_map = True
 
-        self.level = Level(map_number, self)
+        # a recently visited level is reused with its state, only the entry point is recomputed
+        self.level = self.levels.pop(map_number, None)
+        if reset:
+            self.level = None
+        if self.level is None:
+            self.level = self.build_level(map_number)
+        else:
+            self.position = self.level.entry_position(self.from_map) or self.position
 
         self.changed_map = False
         
         self.player.move_to(self.position)
 
-        self.player.obstacle_sprites = self.level.obstacle_sprites
+        self.player.obstacle_grid = self.level.obstacle_grid
         self.player.add(self.level.visible_sprites)
+        # positions from the last visit of a cached level must not be interpolated from
+        self.level.visible_sprites.previous_positions.clear()
+        self.prefetch_neighbours()
+
+    def toggle_overlay(self):
+        """
+        Show or hide the performance overlay. The phases are only
+        measured while the overlay is shown.
+        """
+        self.overlay_active = not self.overlay_active
+        self.profiler.enabled = self.overlay_active
+        self.profiler.reset()
+        if self.overlay_active:
+            self.scenes.push(self.overlay)
+        elif self.overlay in self.scenes:
+            self.scenes.remove(self.overlay)
+
+    def build_level(self, map_number):
+        """
+        Build a level from the data read by the prefetcher, showing a
+        loading indicator if the read has not finished yet.
+
+        Parameters:
+        - map_number: Integer representing the index of the level map.
+
+        Returns:
+        - Instance of the Level class.
+        """
+        if not self.prefetcher.is_ready(map_number):
+            self.show_loading()
+
+        level_data, chunks = self.prefetcher.take(map_number)
+        level = Level(map_number, self, level_data)
+        level.visible_sprites.floor.adopt(chunks)
+        return level
+
+    def prefetch_neighbours(self):
+        """
+        Start reading the maps linked from the current level that are
+        not already built, in the background.
+        """
+        neighbours = {next_map for _, _, next_map in self.level.level_data.transitions}
+        neighbours -= set(self.levels)
+        neighbours.discard(self.level.map_number)
+        self.prefetcher.prefetch(neighbours, self.level.map_number)
+
+    def show_loading(self):
+        """Draw a small loading indicator while a level is read from disk."""
+        text_surf = self.loading_font.render("Loading...", False, TEXT_COLOR)
+        x = self.display_surface.get_size()[0] // 2
+        y = self.display_surface.get_size()[1] - 40
+        text_rect = text_surf.get_rect(center = (x,y))
+
+        pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(20,20))
+        self.display_surface.blit(text_surf, text_rect)
+        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, text_rect.inflate(20,20), 3)
+        pygame.display.update(text_rect.inflate(20,20))
+
+    def cache_level(self, level):
+        """
+        Keep a level for later reuse, dropping the least recently used
+        levels beyond LEVEL_CACHE_SIZE and releasing their floor chunks.
+
+        Parameters:
+        - level: Instance of the Level class that is being left.
+        """
+        self.levels[level.map_number] = level
+        self.levels.move_to_end(level.map_number)
+        while len(self.levels) > LEVEL_CACHE_SIZE:
+            _, evicted = self.levels.popitem(last = False)
+            evicted.visible_sprites.floor.release()
 
     def create_physical_attack(self):
-        """Create a physical attack instance for the player."""
-        self.current_attack = Weapon(self.player, [self.level.visible_sprites, self.level.damaging_sprites])
+        """Hand out a pooled weapon sprite for the physical attack of the player."""
+        self.current_attack = self.weapon_pool.acquire(self.player, [self.level.visible_sprites, self.level.damaging_sprites])
 
     def create_magic(self, style, strength, cost):
         """Create a magic attack instances for the player."""
         if style == "heal":
-            self.magic.heal(self.player, strength, cost, [self.level.visible_sprites])
+            self.magic.heal(self.player, strength, cost)
 
         if style == "flame":
-            self.magic.flame(self.player, cost, [self.level.visible_sprites, self.level.damaging_sprites])
+            self.magic.flame(self.player, cost)
 
     def destroy_physical_attack(self):
-        """Destroy the current physical attack instance."""
+        """Return the current physical attack sprite to the weapon pool."""
         if self.current_attack:
-            self.current_attack.kill()
+            self.weapon_pool.release(self.current_attack)
         self.current_attack = None
 
     def start_mini_game(self):
@@ -114,6 +245,7 @@ class World:
                     treasure.image = graphics["treasures"][3]
 
                 # create the image of the opened chest of the corresponding type
+                self.current_mini_game.start()
                 break
     
     def add_xp(self, value):
@@ -131,108 +263,115 @@ class Level:
     
     Attributes:
     - map_number: Integer representing the index of the level map.
+    - level_data: Instance of CompiledLevel with the preprocessed map layers.
     - visible_sprites: Instance of CameraGroup representing visible sprites in the level.
     - obstacle_sprites: Pygame sprite group representing obstacle sprites in the level.
+    - obstacle_grid: Instance of OccupancyGrid indexing the obstacle sprites by tile cell.
     - map_transition_sprites: Pygame sprite group representing map transition sprites in the level.
-    - damaging_sprites: Pygame sprite group representing damaging sprites in the level.
-    - damageable_sprites: Pygame sprite group representing damageable sprites in the level.
+    - damaging_sprites: SpatialHash of the damaging sprites in the level (weapons).
+    - damageable_sprites: SpatialHash of the damageable sprites in the level (enemies).
     - treasure_sprites: Pygame sprite group representing treasure sprites in the level.
+    - enemy_manager: Instance of EnemyManager running the AI of the enemies in the level.
+    - flow_field: Instance of FlowField leading the chasing enemies around the obstacles to the player.
+    - line_of_sight: Instance of LineOfSight answering whether a tile can be seen from
+    another one, used for enemy awareness and ranged attacks.
     - world: Instance of the World class representing the game world.
     - hud: Instance of the HUD class representing the user interface.
     """
-    def __init__(self, map_number, world):
+    def __init__(self, map_number, world, level_data = None):
         """
         Initialize the Level object with the specified map number and game world.
 
         Parameters:
         - map_number: Integer representing the index of the level map.
         - world: Instance of the World class representing the game world.
+        - level_data: Instance of CompiledLevel already read from disk,
+        loaded here if not given.
         """
         # groups of sprites with different behavior
         self.map_number = map_number
-        self.visible_sprites = CameraGroup(self.map_number)
+        self.level_data = level_data or load_level(self.map_number)
+        self.visible_sprites = CameraGroup(self.level_data)
         self.obstacle_sprites = pygame.sprite.Group()
+        self.obstacle_grid = OccupancyGrid()
         self.map_transition_sprites = pygame.sprite.Group()
 
-        self.damaging_sprites = pygame.sprite.Group()
-        self.damageable_sprites = pygame.sprite.Group()
+        self.damaging_sprites = SpatialHash()
+        self.damageable_sprites = SpatialHash()
         self.treasure_sprites = pygame.sprite.Group()
+        self.flow_field = FlowField(self.level_data.columns, self.level_data.rows)
+        self.line_of_sight = LineOfSight(self.flow_field.walkable)
+        self.enemy_manager = EnemyManager(world.timers, self.damageable_sprites, self.flow_field, self.line_of_sight)
 
         self.world = world
         self.create_map()
+        self.flow_field.add_obstacles(self.obstacle_sprites)
         self.hud = HUD()
 
     def create_map(self):
         """
-        Create the game map by loading layout data and generating sprites, based on CSVs.
+        Create the game map by generating sprites from the compiled level
+        data, which is rebuilt from the CSVs whenever they change.
         """
-        layouts = {
-            "boundary" : import_csv_layout(f"assets/map/level_{self.map_number}_FloorBlocks.csv"),
-            "map_transition" : import_csv_layout(f"assets/map/level_{self.map_number}_MapTransition.csv"),
-            "object": import_csv_layout(f"assets/map/level_{self.map_number}_Objects.csv"),
-            "entities" : import_csv_layout(f"assets/map/level_{self.map_number}_Entities.csv"),
-            "treasures" : import_csv_layout(f"assets/map/level_{self.map_number}_Treasures.csv")
-        }
+        level_data = self.level_data
         graphics = {
             "objects" : import_folder("assets/objects"),
             "treasures" : import_folder("assets/treasure")
         }
 
-        for style, layout in layouts.items():       
-            for row_index, row in enumerate(layout):
-                for col_index, col in enumerate(row):
-                    if col != "-1":
-                        x = col_index * TILESIZE
-                        y = row_index * TILESIZE
-                        
-                        if style == "boundary":
-                            Tile((x,y), [self.obstacle_sprites], "invisible", None)
-                        
-                        if style == "object":
-                            surf = graphics["objects"][int(col)]
-                            Tile((x,y), [self.visible_sprites, self.obstacle_sprites], "object", None, surf)
-
-                        if style == "treasures":
-                            surf = graphics["treasures"][int(col)]
-                            if col == "0":
-                                Tile((x,y), [self.visible_sprites, self.obstacle_sprites, self.treasure_sprites], "treasure", 0, surf)
-                            else:
-                                Tile((x,y), [self.visible_sprites, self.obstacle_sprites, self.treasure_sprites], "treasure", 1, surf)
-                        
-                        if style == "map_transition":
-                            Tile((x,y), [self.map_transition_sprites], "map_transition", col)
-                            
-                            if self.world.changed_map and col == str(self.world.from_map):
-                                if x == 0:
-                                    self.world.position = (x + TILESIZE + 20, y)
-                                elif x + TILESIZE == self.visible_sprites.floor_surf.get_width():
-                                    self.world.position = (x - TILESIZE - 20, y)
-                                elif y == 0:
-                                    self.world.position = (x, y + TILESIZE + 20)
-                                elif y + TILESIZE == self.visible_sprites.floor_surf.get_height():
-                                    self.world.position = (x, y - TILESIZE - 20)
-                                else:
-                                    self.world.position = (x, y + TILESIZE + 20)
-                                
-                        if style == "entities":
-                            if not self.world.changed_map and col == "394":
-                                self.world.position = (x,y)
-                            elif col != "394":
-                                if col == "390" : 
-                                    monster_name = "bamboo"
-                                elif col == "391":
-                                    monster_name = "spirit"
-                                elif col == "392":
-                                    monster_name = "raccoon"
-                                elif col == "393":
-                                    monster_name = "squid"
-                                Enemy(monster_name, 
-                                    (x,y), 
-                                    [self.visible_sprites, 
-                                    self.damageable_sprites], 
-                                    self.obstacle_sprites,
-                                    self.damage_player,
-                                    self.world.add_xp)
+        for x, y, width, height in level_data.boundaries:
+            Tile((x,y), [self.obstacle_sprites], "invisible", None, size = (width, height))
+
+        for x, y, next_map in level_data.transitions:
+            Tile((x,y), [self.map_transition_sprites], "map_transition", next_map)
+
+        if self.world.changed_map:
+            position = self.entry_position(self.world.from_map)
+            if position:
+                self.world.position = position
+
+        for x, y, index in level_data.objects:
+            surf = graphics["objects"][index]
+            Tile((x,y), [self.visible_sprites, self.obstacle_sprites], "object", None, surf)
+
+        if not self.world.changed_map and level_data.player_spawn:
+            self.world.position = level_data.player_spawn
+
+        for monster_name, x, y in level_data.enemies:
+            Enemy(monster_name, 
+                (x,y), 
+                [self.visible_sprites, 
+                self.damageable_sprites], 
+                self.obstacle_grid,
+                self.damage_player,
+                self.world.add_xp,
+                self.enemy_manager)
+
+        for x, y, index in level_data.treasures:
+            surf = graphics["treasures"][index]
+            if index == 0:
+                Tile((x,y), [self.visible_sprites, self.obstacle_sprites, self.treasure_sprites], "treasure", 0, surf)
+            else:
+                Tile((x,y), [self.visible_sprites, self.obstacle_sprites, self.treasure_sprites], "treasure", 1, surf)
+
+        # index the obstacles once, so collisions only test nearby cells
+        for sprite in self.obstacle_sprites:
+            self.obstacle_grid.add(sprite)
+
+        self.visible_sprites.build_static_layer()
+
+    def entry_position(self, from_map):
+        """
+        Return the position at which the player enters this level
+        when coming from another map.
+
+        Parameters:
+        - from_map: Integer representing the index of the previous map.
+
+        Returns:
+        - Tuple with the position of the entry, or None if there is none.
+        """
+        return self.level_data.entry_position(from_map)
 
     def check_map_transition(self):
         """
@@ -249,12 +388,17 @@ class Level:
 
     def player_attack(self):
         """Handle player attacks logic and damage to other sprites."""
+        # only the damageable sprites in the cells touched by an attack are tested
         if self.damaging_sprites:
             for damaging_sprite in self.damaging_sprites:
-                collision_sprites = pygame.sprite.spritecollide(damaging_sprite, self.damageable_sprites, False)
-                if collision_sprites:
-                    for target_sprite in collision_sprites:
-                        target_sprite.get_damage(self.world.player, damaging_sprite.sprite_type)
+                for target_sprite in self.damageable_sprites.collide(damaging_sprite.rect):
+                    target_sprite.get_damage(self.world.player, damaging_sprite.sprite_type)
+
+        # damaging particles (flames) are not sprites, their rects are tested instead
+        if self.damageable_sprites:
+            for rect in self.world.animation_player.damaging_rects():
+                for target_sprite in self.damageable_sprites.collide(rect):
+                    target_sprite.get_damage(self.world.player, "magic")
 
     def damage_player(self, amount, attack_type):
         """
@@ -268,29 +412,44 @@ class Level:
         if self.world.player.vulnerable:
             self.world.player.health -= amount
             print(f"{self.world.player.health}")
-            self.world.player.vulnerable = False
-            self.world.player.hurt_time = pygame.time.get_ticks()
+            self.world.player.start_invincibility()
+            self.world.animation_player.create_particles(attack_type, self.world.player.rect.center)
 
-    def run(self):
+    def update(self):
         """
-        Run the game logic for the current level, including updating sprites, 
-        handling interactions, and checking for level transitions.
+        Advance the current level by one fixed simulation step: update the
+        sprites, handle the interactions and check for level transitions.
         """
-        self.visible_sprites.custom_draw(self.world.player)
-        self.visible_sprites.update()
-        self.hud.display(self.world.player)
-        
-        if self.world.mini_game_active:
-            self.world.solved_mini_game_exp = 0
-            self.world.current_mini_game.run()
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_ESCAPE]:
-                self.world.mini_game_active = False
-        else:
-            self.visible_sprites.enemy_update(self.world.player)
+        profiler = self.world.profiler
+        self.world.controls.advance()
+        self.visible_sprites.snapshot()
+        with profiler.measure("update"):
+            self.visible_sprites.update()
+            self.world.animation_player.update()
+
+        with profiler.measure("enemy_update"):
+            self.enemy_manager.update(self.world.player)
+        with profiler.measure("player_attack"):
             self.player_attack()
+        with profiler.measure("check_map_transition"):
             self.check_map_transition()
-            self.check_death()
+        self.check_death()
+
+    def draw(self, alpha = 1.0):
+        """
+        Render the current level, its particle effects and the HUD.
+
+        Parameters:
+        - alpha: Fraction of a simulation step elapsed since the last update,
+        used to interpolate the moving sprites between their last two positions.
+        """
+        profiler = self.world.profiler
+        with profiler.measure("custom_draw"):
+            self.visible_sprites.custom_draw(self.world.player, alpha)
+        with profiler.measure("particles"):
+            self.world.animation_player.draw(self.visible_sprites.display_surface, self.visible_sprites.viewport)
+        with profiler.measure("hud"):
+            self.hud.display(self.world.player)
 
     def check_death(self):
         """
@@ -299,7 +458,7 @@ class Level:
         """
         if self.world.player.health <= 0:
             self.world.player.health = self.world.player.stats["health"]
-            self.world.change_map(0)
+            self.world.change_map(0, reset = True)
             self.world.player.exp = 0
 
 
@@ -309,20 +468,32 @@ class CameraGroup(pygame.sprite.Group):
     objects relative to it.
 
     Attributes:
-        - level: The level number associated with the camera.
         - display_surface: The surface onto which objects are drawn.
         - half_width: Half the width of the display surface.
         - half_height: Half the height of the display surface.
         - offset: The camera offset vector used for alignment.
-        - floor_surf: The image of the level floor.
-        - floor_rect: The rect object representing the floor surface.
+        - floor: Instance of ChunkedFloor drawing the level floor from
+        the chunks intersecting the viewport.
+        - viewport: The rect of the world area currently seen by the camera.
+        - drawn_count: Number of sprites drawn in the last frame.
+        - culled_count: Number of sprites skipped in the last frame
+        because they were outside the viewport.
+        - static_sprites: Sprites that never move (objects and treasures),
+        presorted by their Y coordinate.
+        - static_keys: The Y coordinates of the static sprites, used for
+        bisecting the part of the list around the viewport.
+        - static_margin: Half the height of the tallest static sprite.
+        - dynamic_sprites: Ordered dictionary of the moving sprites (player,
+        enemies, weapons), sorted on every frame.
+        - previous_positions: Dictionary mapping the moving sprites near the
+        viewport to their top-left position before the last simulation step.
     """
-    def __init__(self, level):
+    def __init__(self, level_data):
         """
-        Initialize the CameraGroup with the given level number.
+        Initialize the CameraGroup for the given level.
 
         Parameters:
-        - level: Integer representing the level number.
+        - level_data: Instance of CompiledLevel of the level.
         """
         super().__init__()
         self.display_surface = pygame.display.get_surface()
@@ -330,27 +501,122 @@ class CameraGroup(pygame.sprite.Group):
         self.half_height = self.display_surface.get_size()[1] // 2
         self.offset = pygame.math.Vector2() 
 
-        self.floor_surf = pygame.image.load(f"assets/map/level_{level}.png").convert()
-        self.floor_rect = self.floor_surf.get_rect(topleft = (0,0))
+        self.floor = ChunkedFloor(level_data.map_number, level_data.width, level_data.height)
+
+        self.viewport = self.display_surface.get_rect()
+        self.drawn_count = 0
+        self.culled_count = 0
+
+        self.static_sprites = []
+        self.static_keys = []
+        self.static_margin = 0
+        self.dynamic_sprites = {}
+        self.previous_positions = {}
+
+    def add_internal(self, sprite, layer = None):
+        """Add a sprite to the group, treating it as a moving sprite."""
+        super().add_internal(sprite)
+        self.dynamic_sprites[sprite] = None
+
+    def remove_internal(self, sprite):
+        """Remove a sprite from the group and from its draw list."""
+        super().remove_internal(sprite)
+        if sprite in self.dynamic_sprites:
+            del self.dynamic_sprites[sprite]
+            self.previous_positions.pop(sprite, None)
+        else:
+            index = self.static_sprites.index(sprite)
+            del self.static_sprites[index]
+            del self.static_keys[index]
 
-    def custom_draw(self, player):
+    def update(self, *args):
         """
-        Draw the visible sprites aligned to the view of the 
-        player. Display objects sorted bu their Y coordinate.
+        Update the moving sprites. Static sprites have nothing to update and
+        enemies are updated by the EnemyManager according to their tier.
+        """
+        for sprite in list(self.dynamic_sprites):
+            if getattr(sprite, "sprite_type", None) != "enemy":
+                sprite.update(*args)
+
+    def snapshot(self):
+        """
+        Remember the positions of the moving sprites near the viewport before
+        a simulation step, so the frame can be drawn between two steps.
+        """
+        area = self.viewport.inflate(self.half_width, self.half_height)
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.dynamic_sprites
+                                   if area.colliderect(sprite.rect)}
+
+    def build_static_layer(self, static_types = ("object", "treasure")):
         """
-        self.offset.x = player.rect.centerx - self.half_width
-        self.offset.y = player.rect.centery - self.half_height
+        Move the sprites that never move out of the dynamic list into a
+        list presorted by their Y coordinate. Called once the map is created.
 
-        floor_offset_position = self.floor_rect.topleft - self.offset
-        self.display_surface.blit(self.floor_surf, floor_offset_position)
+        Parameters:
+        - static_types: Sprite types that are treated as static.
+        """
+        for sprite in list(self.dynamic_sprites):
+            if getattr(sprite, "sprite_type", None) in static_types:
+                del self.dynamic_sprites[sprite]
+                self.static_sprites.append(sprite)
+
+        self.static_sprites.sort(key = lambda sprite: sprite.rect.centery)
+        self.static_keys = [sprite.rect.centery for sprite in self.static_sprites]
+        self.static_margin = max((sprite.rect.height // 2 + 1 for sprite in self.static_sprites), default = 0)
+
+    def custom_draw(self, player, alpha = 1.0):
+        """
+        Draw the visible sprites aligned to the view of the
+        player. Display objects sorted bu their Y coordinate.
+        Sprites outside the viewport are culled and the rest are
+        submitted to the display in a single blits call.
+
+        Moving sprites are drawn between their position before and after
+        the last simulation step, so the motion stays smooth when the
+        display runs at a different rate than the simulation.
+
+        Parameters:
+        - player: Instance of the Player class, followed by the camera.
+        - alpha: Fraction of a simulation step elapsed since the last update.
+        """
+        previous = self.previous_positions
+
+        def position(sprite):
+            x, y = sprite.rect.topleft
+            last = previous.get(sprite)
+            if last is None:
+                return x, y
+            # sprites that jumped (teleports, respawns) are drawn where they are
+            if abs(x - last[0]) > TILESIZE or abs(y - last[1]) > TILESIZE:
+                return x, y
+            return round(last[0] + (x - last[0]) * alpha), round(last[1] + (y - last[1]) * alpha)
+
+        player_x, player_y = position(player)
+        self.offset.x = player_x + player.rect.width // 2 - self.half_width
+        self.offset.y = player_y + player.rect.height // 2 - self.half_height
+        offset_x = int(self.offset.x)
+        offset_y = int(self.offset.y)
+        self.viewport.topleft = (offset_x, offset_y)
+
+        viewport = self.viewport
+        self.floor.draw(self.display_surface, viewport)
+
+        # static sprites are already sorted, so only the band of rows around the viewport is checked
+        first = bisect_left(self.static_keys, viewport.top - self.static_margin)
+        last = bisect_right(self.static_keys, viewport.bottom + self.static_margin)
+        static = [sprite for sprite in self.static_sprites[first:last] if viewport.colliderect(sprite.rect)]
+        dynamic = [sprite for sprite in self.dynamic_sprites if viewport.colliderect(sprite.rect)]
 
         #sort the drawing order by the y coordinate of the object/player
-        for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-            offset_position = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_position)
-
-    def enemy_update(self, player):
-        """Update the enemy sprites."""
-        enemy_sprites = [sprite for sprite in self.sprites() if hasattr(sprite, "sprite_type") and sprite.sprite_type == "enemy"]
-        for enemy in enemy_sprites:
-            enemy.enemy_update(player)
+        depth = lambda sprite: sprite.rect.centery
+        dynamic.sort(key = depth)
+        on_screen = list(merge(static, dynamic, key = depth))
+        self.drawn_count = len(on_screen)
+        self.culled_count = len(self) - self.drawn_count
+
+        blit_list = []
+        for sprite in on_screen:
+            x, y = position(sprite)
+            blit_list.append((sprite.image, (x - offset_x, y - offset_y)))
+        self.display_surface.blits(blit_list, doreturn = False)
+
@@ -0,0 +1,313 @@
+import os
+import pickle
+import pygame
+from array import array
+from settings import *
+from helpers import import_csv_layout
+
+# version of the compiled format, bump it when CompiledLevel changes
+COMPILED_LEVEL_VERSION = 1
+
+LEVEL_LAYERS = {
+    "boundary" : "FloorBlocks",
+    "map_transition" : "MapTransition",
+    "object" : "Objects",
+    "entities" : "Entities",
+    "treasures" : "Treasures"
+}
+
+PLAYER_SPAWN_ID = 394
+ENEMY_IDS = {
+    390 : "bamboo",
+    391 : "spirit",
+    392 : "raccoon",
+    393 : "squid"
+}
+
+
+class CompiledLevel:
+    """
+    Compact, preprocessed form of the CSV layers of a level map.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+    - columns: Number of tile columns of the map.
+    - rows: Number of tile rows of the map.
+
+    Attributes:
+    - map_number: Integer representing the index of the level map.
+    - columns: Number of tile columns of the map.
+    - rows: Number of tile rows of the map.
+    - width: Width of the map in pixels.
+    - height: Height of the map in pixels.
+    - layers: Dictionary mapping a layer name to a row-major array('h')
+    of its tile values, -1 meaning an empty cell.
+    - boundaries: List of (x, y, width, height) merged rects covering
+    the boundary layer.
+    - objects: List of (x, y, graphic index) of the object tiles.
+    - treasures: List of (x, y, graphic index) of the treasure tiles.
+    - transitions: List of (x, y, next map) of the map transition tiles.
+    - player_spawn: The (x, y) position of the player spawn, or None.
+    - enemies: List of (enemy name, x, y) of the enemy spawn points.
+    - sources: Dictionary mapping each source CSV path to its mtime.
+    - version: Version of the compiled format.
+    """
+    def __init__(self, map_number, columns, rows):
+        """
+        Initialize an empty compiled level of the given size.
+        """
+        self.map_number = map_number
+        self.columns = columns
+        self.rows = rows
+        self.width = columns * TILESIZE
+        self.height = rows * TILESIZE
+
+        self.layers = {}
+        self.boundaries = []
+        self.objects = []
+        self.treasures = []
+        self.transitions = []
+        self.player_spawn = None
+        self.enemies = []
+        self.sources = {}
+        self.version = COMPILED_LEVEL_VERSION
+
+    def entry_position(self, from_map):
+        """
+        Return the position at which the player enters this level
+        when coming from another map.
+
+        Parameters:
+        - from_map: Integer representing the index of the previous map.
+
+        Returns:
+        - Tuple with the position next to the transition tile leading
+        back to the previous map, or None if there is no such tile.
+        """
+        position = None
+        for x, y, next_map in self.transitions:
+            if next_map == from_map:
+                if x == 0:
+                    position = (x + TILESIZE + 20, y)
+                elif x + TILESIZE == self.width:
+                    position = (x - TILESIZE - 20, y)
+                elif y == 0:
+                    position = (x, y + TILESIZE + 20)
+                elif y + TILESIZE == self.height:
+                    position = (x, y - TILESIZE - 20)
+                else:
+                    position = (x, y + TILESIZE + 20)
+        return position
+
+    def cells(self, layer):
+        """
+        Iterate over the non-empty cells of a layer.
+
+        Parameters:
+        - layer: Name of the layer, one of LEVEL_LAYERS.
+
+        Returns:
+        - Generator of (column, row, value) tuples.
+        """
+        columns = self.columns
+        for index, value in enumerate(self.layers[layer]):
+            if value != -1:
+                yield index % columns, index // columns, value
+
+
+def source_path(map_number, layer):
+    """
+    Return the path of the CSV file of a layer. The file name is matched
+    case-insensitively, because some of the maps were exported on Windows.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+    - layer: Name of the layer, one of LEVEL_LAYERS.
+
+    Returns:
+    - The path of the CSV file.
+    """
+    file_name = f"level_{map_number}_{LEVEL_LAYERS[layer]}.csv"
+    for existing in os.listdir("assets/map"):
+        if existing.lower() == file_name.lower():
+            return f"assets/map/{existing}"
+    return f"assets/map/{file_name}"
+
+def cache_path(map_number):
+    """Return the path of the compiled cache file of a level."""
+    return f"assets/map/cache/level_{map_number}.bin"
+
+def merge_boundaries(layer, columns, rows):
+    """
+    Combine the occupied cells of the boundary layer into merged rects
+    with a greedy pass, which is not necessarily minimal: horizontal
+    runs of each row are extended downwards while the next row has a
+    run with the same columns.
+
+    Parameters:
+    - layer: Row-major array of the boundary layer.
+    - columns: Number of tile columns of the map.
+    - rows: Number of tile rows of the map.
+
+    Returns:
+    - List of (x, y, width, height) rects in pixels.
+    """
+    rects = []
+    open_rects = {}
+    for row in range(rows + 1):
+        runs = set()
+        col = 0
+        while row < rows and col < columns:
+            if layer[row * columns + col] != -1:
+                start = col
+                while col < columns and layer[row * columns + col] != -1:
+                    col += 1
+                runs.add((start, col))
+            col += 1
+
+        # close the rects that do not continue in this row
+        for run in list(open_rects):
+            if run not in runs:
+                top = open_rects.pop(run)
+                rects.append((run[0] * TILESIZE, top * TILESIZE, (run[1] - run[0]) * TILESIZE, (row - top) * TILESIZE))
+        for run in runs:
+            open_rects.setdefault(run, row)
+
+    rects.sort(key = lambda rect: (rect[1], rect[0]))
+    return rects
+
+def compile_level(map_number):
+    """
+    Compile the CSV layers of a level into a CompiledLevel.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+
+    Returns:
+    - Instance of CompiledLevel.
+    """
+    compiled = None
+    for layer in LEVEL_LAYERS:
+        path = source_path(map_number, layer)
+        layout = import_csv_layout(path)
+        if compiled is None:
+            compiled = CompiledLevel(map_number, len(layout[0]), len(layout))
+        compiled.sources[path] = os.path.getmtime(path)
+        compiled.layers[layer] = array("h", (int(col) for row in layout for col in row))
+
+    compiled.boundaries = merge_boundaries(compiled.layers["boundary"], compiled.columns, compiled.rows)
+
+    for col, row, value in compiled.cells("object"):
+        compiled.objects.append((col * TILESIZE, row * TILESIZE, value))
+
+    for col, row, value in compiled.cells("treasures"):
+        compiled.treasures.append((col * TILESIZE, row * TILESIZE, value))
+
+    for col, row, value in compiled.cells("map_transition"):
+        compiled.transitions.append((col * TILESIZE, row * TILESIZE, value))
+
+    for col, row, value in compiled.cells("entities"):
+        if value == PLAYER_SPAWN_ID:
+            compiled.player_spawn = (col * TILESIZE, row * TILESIZE)
+        elif value in ENEMY_IDS:
+            compiled.enemies.append((ENEMY_IDS[value], col * TILESIZE, row * TILESIZE))
+
+    return compiled
+
+def is_up_to_date(compiled):
+    """
+    Check whether a compiled level still matches its source CSVs.
+
+    Parameters:
+    - compiled: Instance of CompiledLevel read from the cache.
+
+    Returns:
+    - True if the format version and all source mtimes match.
+    """
+    if getattr(compiled, "version", None) != COMPILED_LEVEL_VERSION:
+        return False
+    for path, mtime in compiled.sources.items():
+        if not os.path.exists(path) or os.path.getmtime(path) != mtime:
+            return False
+    return True
+
+def load_level(map_number):
+    """
+    Load the compiled form of a level, rebuilding the on-disk cache
+    when it is missing or older than the source CSVs.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+
+    Returns:
+    - Instance of CompiledLevel.
+    """
+    path = cache_path(map_number)
+    try:
+        with open(path, "rb") as cache_file:
+            compiled = pickle.load(cache_file)
+        if is_up_to_date(compiled):
+            return compiled
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    compiled = compile_level(map_number)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(path, "wb") as cache_file:
+            pickle.dump(compiled, cache_file, protocol = pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # the cache is only an optimization, the CSVs stay the source of truth
+        pass
+    return compiled
+
+def floor_path(map_number):
+    """Return the path of the floor image of a level."""
+    return f"assets/map/level_{map_number}.png"
+
+def floor_chunk_dir(map_number):
+    """Return the cache folder holding the floor chunks of a level."""
+    return f"assets/map/cache/level_{map_number}_floor"
+
+def floor_chunk_path(map_number, col, row):
+    """Return the path of a single floor chunk image."""
+    return f"{floor_chunk_dir(map_number)}/{col}_{row}.png"
+
+def compile_floor(map_number, chunk_size = FLOOR_CHUNK_SIZE):
+    """
+    Split the floor image of a level into chunk_size square chunk images
+    in the cache, unless they are already there and newer than the
+    floor image.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+    - chunk_size: Size of a chunk in pixels.
+
+    Returns:
+    - True if the chunks are available on disk, False if they could not
+    be written and the floor has to be sliced in memory.
+    """
+    source = floor_path(map_number)
+    manifest_path = f"{floor_chunk_dir(map_number)}/manifest.bin"
+    manifest = (COMPILED_LEVEL_VERSION, os.path.getmtime(source), chunk_size)
+    try:
+        with open(manifest_path, "rb") as manifest_file:
+            if pickle.load(manifest_file) == manifest:
+                return True
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    floor_surf = pygame.image.load(source)
+    floor_rect = floor_surf.get_rect()
+    try:
+        os.makedirs(floor_chunk_dir(map_number), exist_ok = True)
+        for row in range((floor_rect.height - 1) // chunk_size + 1):
+            for col in range((floor_rect.width - 1) // chunk_size + 1):
+                chunk_rect = pygame.Rect(col * chunk_size, row * chunk_size, chunk_size, chunk_size).clip(floor_rect)
+                pygame.image.save(floor_surf.subsurface(chunk_rect), floor_chunk_path(map_number, col, row))
+        # the manifest is written last, so an interrupted compile is redone
+        with open(manifest_path, "wb") as manifest_file:
+            pickle.dump(manifest, manifest_file)
+    except (OSError, pygame.error):
+        return False
+    return True
@@ -0,0 +1,133 @@
+from settings import *
+
+
+class LineOfSight:
+    """
+    Line-of-sight queries over the tile grid of a level: the view between
+    two tiles is blocked when the line between them crosses a tile that is
+    not walkable (boundaries and objects).
+
+    Lines are traced with Bresenham's algorithm over the tiles. Enemy
+    awareness asks the same questions every tick, so the results towards
+    the tile of the player are cached by the tile of the looker; the cache
+    is dropped when the player enters another tile, and an enemy moving to
+    another tile simply looks up another entry.
+
+    Parameters:
+    - walkable: Array of flags telling whether a tile can be walked on,
+    indexed by row and column, usually shared with the FlowField.
+
+    Attributes:
+    - walkable: Array of flags telling whether a tile can be walked on.
+    - target: (column, row) of the tile the cached results look at, or None.
+    - cache: Dictionary mapping the (column, row) of a looking tile to
+    whether the target tile can be seen from it.
+    - queries: Number of queries since the counters were last reset.
+    - traces: Number of lines traced since the counters were last reset.
+
+    Methods:
+    - tile(position): Return the tile containing a position.
+    - trace(start, end): Trace the line between two tiles.
+    - visible(start, end): Return whether a tile can be seen from another, cached.
+    - can_see(position, target_position): Return whether a position can be seen from another.
+    - reset_counters(): Reset the query and trace counters.
+    """
+    def __init__(self, walkable):
+        """Initialize the queries over a grid with an empty cache."""
+        self.walkable = walkable
+        self.target = None
+        self.cache = {}
+        self.queries = 0
+        self.traces = 0
+
+    def tile(self, position):
+        """
+        Return the tile containing a position.
+
+        Parameters:
+        - position: (x, y) position in world coordinates.
+
+        Returns:
+        - Tuple (column, row).
+        """
+        return int(position[0]) // TILESIZE, int(position[1]) // TILESIZE
+
+    def trace(self, start, end):
+        """
+        Trace the line between two tiles, without using the cache.
+
+        Parameters:
+        - start: (column, row) of the first tile.
+        - end: (column, row) of the second tile.
+
+        Returns:
+        - True if no tile between them is blocked, the end tiles themselves
+        are not tested. Tiles outside the grid block the view.
+        """
+        self.traces += 1
+        walkable = self.walkable
+        rows, columns = walkable.shape
+        col, row = start
+        end_col, end_row = end
+        delta_col = abs(end_col - col)
+        delta_row = -abs(end_row - row)
+        step_col = 1 if col < end_col else -1
+        step_row = 1 if row < end_row else -1
+        error = delta_col + delta_row
+        while True:
+            doubled = error * 2
+            if doubled >= delta_row:
+                if col == end_col:
+                    break
+                error += delta_row
+                col += step_col
+            if doubled <= delta_col:
+                if row == end_row:
+                    break
+                error += delta_col
+                row += step_row
+            if (col, row) == (end_col, end_row):
+                break
+            if not (0 <= col < columns and 0 <= row < rows) or not walkable[row, col]:
+                return False
+        return True
+
+    def visible(self, start, end):
+        """
+        Return whether a tile can be seen from another one, using the
+        cached result when the end tile is the current target.
+
+        Parameters:
+        - start: (column, row) of the looking tile.
+        - end: (column, row) of the looked at tile.
+
+        Returns:
+        - True if the line between the tiles is not blocked.
+        """
+        self.queries += 1
+        if end != self.target:
+            self.target = end
+            self.cache.clear()
+        result = self.cache.get(start)
+        if result is None:
+            result = self.cache[start] = self.trace(start, end)
+        return result
+
+    def can_see(self, position, target_position):
+        """
+        Return whether a position can be seen from another one, e.g. to
+        check whether a ranged attack can reach the player.
+
+        Parameters:
+        - position: (x, y) position of the looker in world coordinates.
+        - target_position: (x, y) position of the target in world coordinates.
+
+        Returns:
+        - True if the line between their tiles is not blocked.
+        """
+        return self.visible(self.tile(position), self.tile(target_position))
+
+    def reset_counters(self):
+        """Reset the query and trace counters."""
+        self.queries = 0
+        self.traces = 0
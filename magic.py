@@ -7,17 +7,17 @@ class Magic:
     def __init__(self, animation_player):
         self.animation_player = animation_player
 
-    def heal(self, player, strength, cost, groups):
+    def heal(self, player, strength, cost):
         if player.energy >= cost:
             player.health += strength
             player.energy -= cost
             if player.health >= player.stats["health"]:
                 player.health = player.stats["health"]
             
-            self.animation_player.create_particles("aura", player.rect.center, groups)
-            self.animation_player.create_particles("heal", player.rect.center + pygame.math.Vector2(0,-60), groups)
+            self.animation_player.create_particles("aura", player.rect.center)
+            self.animation_player.create_particles("heal", player.rect.center + pygame.math.Vector2(0,-60))
 
-    def flame(self, player, cost, groups):
+    def flame(self, player, cost):
         if player.energy >= cost:
             player.energy -= cost
             
@@ -35,9 +35,9 @@ class Magic:
                     offset_x = (direction.x * i) * TILESIZE
                     x = player.rect.centerx + offset_x
                     y = player.rect.centery 
-                    self.animation_player.create_particles("flame", (x,y), groups)
+                    self.animation_player.create_particles("flame", (x,y), damaging = True)
                 else:
                     offset_y = (direction.y * i) * TILESIZE
                     x = player.rect.centerx
                     y = player.rect.centery + offset_y
-                    self.animation_player.create_particles("flame", (x,y), groups)
\ No newline at end of file
+                    self.animation_player.create_particles("flame", (x,y), damaging = True)
\ No newline at end of file
@@ -1,6 +1,10 @@
-import pygame, sys
+import pygame, sys, os
+from argparse import ArgumentParser
+from time import perf_counter
 from settings import *
 from level import World, Level
+from controls import ScriptedInput
+from scenes import SceneStack, WorldScene
 
 
 class Game:
@@ -11,24 +15,47 @@ class Game:
     Attributes:
     - screen: Pygame window surface.
     - clock: Pygame clock object for controlling frame rate.
+    - step: Duration of a simulation step in milliseconds.
+    - accumulator: Time in milliseconds not yet consumed by simulation steps.
+    - headless: Boolean indicating whether the game runs without a window,
+    driven by scripted input.
+    - scenes: The SceneStack of the game, with the world at the bottom and
+    mini-games and overlays pushed on top.
     - world: Instance of the game world containing levels, player,
     and other game state related data.
     """
-    def __init__(self):
+    def __init__(self, headless = False):
         """
         Initialize the Game object by setting up Pygame window, caption,
         and clock,and creating the game world.
+
+        Parameters:
+        - headless: Boolean indicating whether to run on SDL's dummy video
+        driver with scripted input instead of a window and the keyboard.
         """
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH,HEIGHT))
         pygame.display.set_caption("MagiSpeech")
         self.clock = pygame.time.Clock()
+        self.step = 1000 / SIMULATION_RATE
+        self.accumulator = 0
 
-        self.world = World()
+        self.scenes = SceneStack()
+        self.world = World(ScriptedInput() if headless else None, self.scenes)
+        self.scenes.push(WorldScene(self.world))
 
     def run(self):
         """
         Handle events, update the game world, and render the game.
+
+        The scenes are updated in fixed simulation steps, as many as fit into
+        the time elapsed since the last frame, and then drawn once with the
+        moving sprites interpolated by the leftover fraction of a step. Only
+        the screen areas reported by the scenes are updated on the display.
         """
         while True:
             for event in pygame.event.get():
@@ -36,19 +63,75 @@ class Game:
                     pygame.quit()
                     sys.exit()
 
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_e:
-                    self.world.start_mini_game()
-                    
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    self.world.mini_game_active = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.world.toggle_overlay()
+                else:
+                    self.scenes.handle_event(event)
+
+            steps = 0
+            while self.accumulator >= self.step and steps < MAX_SIMULATION_STEPS:
+                self.scenes.update()
+                self.accumulator -= self.step
+                steps += 1
+            if steps == MAX_SIMULATION_STEPS:
+                # the game fell behind, drop the remaining time instead of spiralling
+                self.accumulator = min(self.accumulator, self.step)
+
+            dirty_rects = self.scenes.draw(self.accumulator / self.step)
+            if dirty_rects is None:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+            frame_time = self.clock.tick(FPS)
+            self.accumulator += frame_time
+
+            profiler = self.world.profiler
+            if profiler.enabled:
+                profiler.add("frame", frame_time / 1000)
+                profiler.end_frame()
 
-            self.screen.fill("black")
-            self.world.level.run() 
+    def run_headless(self, ticks, render = False):
+        """
+        Step the simulation as fast as possible without waiting for the
+        frame clock and print the throughput.
+
+        Parameters:
+        - ticks: Number of simulation steps to run.
+        - render: Boolean indicating whether every step is also drawn to
+        the off-screen display surface.
 
-            pygame.display.update()
-            self.clock.tick(FPS)
+        Returns:
+        - Dictionary with the number of ticks, the elapsed seconds and the
+        ticks per second.
+        """
+        start = perf_counter()
+        for _ in range(ticks):
+            pygame.event.pump()
+            self.scenes.update()
+            if render:
+                self.scenes.draw()
+        elapsed = perf_counter() - start
+
+        result = {"ticks" : ticks, "seconds" : elapsed, "ticks_per_second" : ticks / elapsed if elapsed else 0}
+        print(f"{ticks} ticks in {elapsed:.3f}s ({result['ticks_per_second']:.1f} ticks/s), "
+              f"map {self.world.level.map_number}, player at {self.world.player.rect.center}, "
+              f"{len(self.world.level.enemy_manager)} enemies")
+        return result
 
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = ArgumentParser(description = "MagiSpeech")
+    parser.add_argument("--headless", action = "store_true",
+                        help = "run without a window, driven by scripted input")
+    parser.add_argument("--ticks", type = int, default = 600,
+                        help = "number of simulation steps to run in headless mode")
+    parser.add_argument("--render", action = "store_true",
+                        help = "also draw every step off-screen in headless mode")
+    args = parser.parse_args()
+
+    game = Game(headless = args.headless)
+    if args.headless:
+        game.run_headless(args.ticks, args.render)
+        pygame.quit()
+    else:
+        game.run()
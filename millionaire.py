@@ -2,6 +2,7 @@ import pygame
 from random import shuffle
 import textwrap
 from settings import *
+from scenes import Scene
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -103,15 +104,18 @@ questions = [
     }
 ]
 
-class Game:
+class Game(Scene):
     """
-    A class representing the Who Wants to Be a Millionaire game.
+    A class representing the Who Wants to Be a Millionaire game,
+    played as a scene on top of the world.
+
+    Parameters:
+    - world: The instance of the game world.
+    - on_end: Optional function called with the game when it finishes.
 
     Attributes:
     - world: The instance of the game world.
     - screen: The game display surface.
-    - running: Indicates whether the game is currently running.
-    - clock: The clock object for controlling the game's frame rate.
     - title_font: The font object for rendering the title text.
     - question_font: The font object for rendering the question text.
     - answer_font: The font object for rendering the answer text.
@@ -120,7 +124,16 @@ class Game:
     - selected_answer: Index of the currently selected answer.
     - correct_answers: Number of correct answers given by the player.
     - exp: Experience points awarded for each correct answer.
-    - end_game_timer: Timer for ending the game after a delay.
+    - end_game_timer: Timer of the scene stack ending the game 5 seconds
+    after the game over screen was shown, or None.
+    - background: Pre-rendered static layer with everything except the
+    selection indicator, rebuilt only when the question or score changes.
+    - background_key: The (question, score, game over) state the static
+    layer was rendered for.
+    - selection_rect: Screen area covered by the drawn selection
+    indicator, or None.
+    - drawn_selection: Index of the answer whose selection indicator
+    is on the screen.
 
     Methods:
     end_game(): Ends the game and updates the world with the player's score.
@@ -131,21 +144,23 @@ class Game:
     draw_score(): Renders and displays the player's score.
     draw_game_over(): Renders and displays the game over screen.
     draw_instructions(): Renders and displays game instructions.
-    run(): Main game loop responsible for running the game logic and rendering.
+    build_background(): Renders the static layer of the current state.
+    handle_event(event): Selects and chooses answers, Escape forfeits the game.
+    draw(alpha): Updates the parts of the display that changed.
     """
-    def __init__(self, world):
+    def __init__(self, world, on_end = None):
         """
         Initialize the game with the given world instance.
 
         Parameters:
         - world: The instance of the game world.
+        - on_end: Optional function called with the game when it finishes.
         """
+        super().__init__(on_end)
         shuffle(questions)
         self.questions_this_game = questions[:3]
         self.screen = pygame.display.get_surface()
-        self.running = True
 
-        self.clock = pygame.time.Clock()
         self.world = world
 
         self.title_font = pygame.font.SysFont(UI_FONT, 48)
@@ -161,17 +176,22 @@ class Game:
         self.exp = minigame_stats["millionaire"]
         self.end_game_timer = None
 
+        self.background = pygame.Surface(self.screen.get_size())
+        self.background_key = None
+        self.selection_rect = None
+        self.drawn_selection = -1
+
     def end_game(self):
         """End the game and update the world with the player's score."""
         self.world.game_correct_answers = self.correct_answers
         self.world.solved_mini_game = True
-        self.running = False
+        self.finish()
 
     def draw_title(self):
         """Render and display the game title."""
         title = self.title_font.render("Who Wants to Be a Millionaire?", True, BLACK)
         title_rect = title.get_rect(centerx=self.screen.get_rect().centerx, centery=50)
-        self.screen.blit(title, title_rect)
+        self.background.blit(title, title_rect)
 
     def draw_question(self):
         """Render and display the current question."""
@@ -179,7 +199,7 @@ class Game:
         question_text = self.question_font.render(question, True, BLACK)
         question_rect = question_text.get_rect(centerx=self.screen.get_rect().centerx, centery=200)
 
-        self.screen.blit(question_text, question_rect)
+        self.background.blit(question_text, question_rect)
 
     def draw_answers(self):
         """Render and display the answer choices."""
@@ -200,13 +220,18 @@ class Game:
             elif i == 3: # Bottom right
                 answer_rect = answer_text.get_rect(centerx=self.screen.get_rect().centerx + 200, centery=450)
 
-            pygame.draw.rect(self.screen, WHITE, answer_rect.inflate(20, 10))
+            pygame.draw.rect(self.background, WHITE, answer_rect.inflate(20, 10))
 
-            self.screen.blit(answer_text, answer_rect)
+            self.background.blit(answer_text, answer_rect)
 
     def draw_selection(self):
-        """Render and display the selection indicator."""
-        if self.selected_answer != -1:
+        """
+        Render and display the selection indicator.
+
+        Returns:
+        - The screen area covered by the indicator, or None if no answer is selected.
+        """
+        if self.selected_answer != -1 and not self.game_over:
             selected_rect = pygame.Rect(0, 0, 200, 50)
             if self.selected_answer == 0: # Top left
                 selected_rect.center = (self.screen.get_rect().centerx - 200, 300)
@@ -216,32 +241,31 @@ class Game:
                 selected_rect.center = (self.screen.get_rect().centerx - 200, 450)
             elif self.selected_answer == 3: # Bottom right
                 selected_rect.center = (self.screen.get_rect().centerx + 200, 450)
-            pygame.draw.rect(self.screen, RED, selected_rect.inflate(20, 10), 5)
+            return pygame.draw.rect(self.screen, RED, selected_rect.inflate(20, 10), 5)
+        return None
 
     def draw_score(self):
         """Render and display the player's score."""
         score = self.answer_font.render(f"Score: {self.correct_answers}/3", True, BLACK)
         score_rect = score.get_rect()
         score_rect.bottomright = (780, 580)
-        self.screen.blit(score, score_rect)
+        self.background.blit(score, score_rect)
 
     def draw_game_over(self):
         """Render and display the game over screen."""
-        self.screen.fill(WHITE)
+        self.background.fill(WHITE)
 
         message = self.title_font.render(f"You got {self.correct_answers}/3 correct!", True, BLACK)
         message_rect = message.get_rect(centerx=self.screen.get_rect().centerx, centery=self.screen.get_rect().centery - 80)
-        self.screen.blit(message, message_rect)
+        self.background.blit(message, message_rect)
 
         text = self.answer_font.render(f'Each correct answer gives you {self.exp}EXP.', True, BLUE)
         text_rect = text.get_rect(centerx=self.screen.get_rect().centerx, centery=self.screen.get_rect().centery)
-        self.screen.blit(text, text_rect)
+        self.background.blit(text, text_rect)
         
         all_exp = self.answer_font.render(f'You get {self.correct_answers*self.exp}EXP.', True, GREEN)
         all_exp_rect = all_exp.get_rect(centerx=self.screen.get_rect().centerx, centery=self.screen.get_rect().centery + 80)
-        self.screen.blit(all_exp, all_exp_rect)
-
-        pygame.time.wait(1000)
+        self.background.blit(all_exp, all_exp_rect)
 
     def draw_instructions(self):
         """Render and display game instructions."""
@@ -250,49 +274,86 @@ class Game:
         for line in lines:
             text = self.answer_font.render(line, True, BLACK)
             text_rect = text.get_rect(centerx=self.screen.get_rect().centerx, centery=(self.screen.get_height() - 100 + y_offset))
-            self.screen.blit(text, text_rect)
+            self.background.blit(text, text_rect)
             y_offset += text.get_height()
 
-    def run(self):
+    def build_background(self):
         """
-        Run the main game loop, responsible for 
-        updating the game logic and rendering.
+        Render the static layer of the current state: the question screen
+        without the selection indicator, or the game over screen.
         """
-        while self.running:
-            self.clock.tick(60)
-
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                    if not self.game_over:
-                        if event.key == pygame.K_SPACE:
-                            self.selected_answer = (self.selected_answer + 1) % 4
-                        elif self.selected_answer != -1 and event.key == pygame.K_RETURN:
-                            if self.selected_answer == questions[self.current_question]["correct"]:
-                                self.correct_answers += 1
-                            if self.current_question <  NUMBER_OF_QUESTIONS-1:
-                                self.current_question += 1
-                                self.selected_answer = -1
-                            else:
-                                self.game_over = True
-                                self.end_game_timer = pygame.time.get_ticks()
-                                
-            
-            self.screen.fill(WHITE)
+        if self.game_over:
+            self.draw_game_over()
+        else:
+            self.background.fill(WHITE)
             self.draw_instructions()
             self.draw_title()
             self.draw_question()
             self.draw_answers()
-            self.draw_selection()
             self.draw_score()
 
-            if self.game_over:
-                self.draw_game_over()
+    def handle_event(self, event):
+        """
+        Select an answer with Space, choose it with Enter
+        and forfeit the game with Escape.
+
+        Parameters:
+        - event: The Pygame event.
+
+        Returns:
+        - True, the game consumes all events.
+        """
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                if self.end_game_timer:
+                    self.end_game_timer.cancel()
+                self.finish()
+            elif not self.game_over:
+                if event.key == pygame.K_SPACE:
+                    self.selected_answer = (self.selected_answer + 1) % 4
+                elif self.selected_answer != -1 and event.key == pygame.K_RETURN:
+                    if self.selected_answer == questions[self.current_question]["correct"]:
+                        self.correct_answers += 1
+                    if self.current_question <  NUMBER_OF_QUESTIONS-1:
+                        self.current_question += 1
+                        self.selected_answer = -1
+                    else:
+                        self.game_over = True
+                        self.end_game_timer = self.stack.timers.schedule(5000, self.end_game)
+        return True
+
+    def draw(self, alpha = 1.0):
+        """
+        Update the parts of the display that changed: the whole screen when
+        the static layer had to be rebuilt or the scene was invalidated,
+        otherwise only the old and the new area of the selection indicator.
+        Nothing is drawn while the state does not change.
+
+        Parameters:
+        - alpha: Fraction of a simulation step, unused.
+
+        Returns:
+        - List of the changed screen rects, or None if the whole screen changed.
+        """
+        key = (self.current_question, self.correct_answers, self.game_over)
+        if key != self.background_key or self.invalid:
+            if key != self.background_key:
+                self.background_key = key
+                self.build_background()
+            self.invalid = False
+            self.screen.blit(self.background, (0, 0))
+            self.selection_rect = self.draw_selection()
+            self.drawn_selection = self.selected_answer
+            return None
 
-                current_time = pygame.time.get_ticks()
-                if current_time - self.end_game_timer >= 5000:
-                    self.end_game()
-            
-            pygame.display.flip()
+        if self.selected_answer == self.drawn_selection:
+            return []
+        self.drawn_selection = self.selected_answer
+        dirty_rects = []
+        if self.selection_rect:
+            self.screen.blit(self.background, self.selection_rect, self.selection_rect)
+            dirty_rects.append(self.selection_rect)
+        self.selection_rect = self.draw_selection()
+        if self.selection_rect:
+            dirty_rects.append(self.selection_rect)
+        return dirty_rects
@@ -17,8 +17,10 @@ class MiniGame:
     - world: An instance of the World class representing the game.
 
     Methods:
-        run(): Executes a randomly selected mini-game from a 
-        predefined list and updates the game state based on the outcome.
+        start(): Pushes a randomly selected mini-game from a
+        predefined list onto the scene stack of the world.
+        end(game_instance): Updates the game state based on the
+        outcome once the mini-game scene finished.
     """
     def __init__(self, world):
         """
@@ -29,16 +31,23 @@ class MiniGame:
         """
         self.world = world
 
-    def run(self):
+    def start(self):
         """
-        Run a randomly selected mini-game and add experience from
-        it to the player.
+        Start a randomly selected mini-game as a scene on top of the world.
         """
         games = [sliding_puzzle.Game, millionaire.Game]
         selected_game = choice(games)
-        
-        game_instance = selected_game(self.world)
-        game_instance.run()
+
+        game_instance = selected_game(self.world, on_end = self.end)
+        self.world.scenes.push(game_instance)
+
+    def end(self, game_instance):
+        """
+        Add experience from the finished mini-game to the player.
+
+        Parameters:
+        - game_instance: The finished mini-game scene.
+        """
         self.world.mini_game_active = False
 
         if self.world.solved_mini_game:
@@ -1,37 +1,180 @@
 import pygame
+import numpy as np
+from os import path
+from settings import *
 from helpers import import_folder
-from random import choice
+
+# folders of the animation frames of every effect type; effects whose folder
+# does not exist (some enemy attacks have no graphics yet) are not spawned
+PARTICLE_FOLDERS = {
+    "flame": "assets/particles/flame/frames",
+    "aura": "assets/particles/aura",
+    "heal": "assets/particles/heal/frames",
+    "slash": "assets/particles/slash",
+    "claw": "assets/particles/claw",
+    "thunder": "assets/particles/thunder",
+    "leaf_attack": "assets/particles/leaf_attack"
+}
 
 
 class AnimationPlayer:
-    def __init__(self):
-        self.frames = {
-			"flame": import_folder("assets/particles/flame/frames"),
-			"aura": import_folder("assets/particles/aura"),
-			"heal": import_folder("assets/particles/heal/frames"),
-			}
-
-    def create_particles(self, animation_type, position, groups):
-        animation_frames = self.frames[animation_type]
-        ParticleEffect(position, animation_frames, groups)
-
-
-class ParticleEffect(pygame.sprite.Sprite):
-    def __init__(self, position, animation_frames, groups):
-        super().__init__(groups)
-        self.sprite_type = "magic"
-        self.frame_index = 0
-        self.animation_speed = 0.15
-        self.frames = animation_frames
-        self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_rect(center = position)
-
-    def animate(self):
-        self.frame_index += self.animation_speed
-        if self.frame_index >= len(self.frames):
-            self.kill()
-        else:
-            self.image = self.frames[int(self.frame_index)]
+    """
+    Fixed-capacity pool of particle effects (spells, enemy attacks) stored
+    as arrays instead of sprites.
+
+    Every particle occupies a slot holding its center, animation frame,
+    frame count and type. All particles are advanced in one vectorized
+    step per tick and the visible ones are drawn with a single blits call,
+    so spawning many effects creates no objects and leaves the sprite
+    groups and their depth sorting untouched.
+
+    The frames of all effect types are kept in one flat list, the frame of
+    a particle being surfaces[first_frame[type] + frame index].
+
+    Parameters:
+    - capacity: Maximum number of simultaneous particles.
+
+    Attributes:
+    - types: Dictionary mapping the available effect types to their index.
+    - surfaces: Flat list of the animation frames of all effect types.
+    - first_frame: Array of the index of the first frame of each type in surfaces.
+    - frame_count: Array of the number of frames of each type.
+    - sizes: Array of the width and height of every surface.
+    - capacity: Maximum number of simultaneous particles.
+    - centers: Array of the particle centers in world coordinates.
+    - frame: Array of the animation progress of the particles, in frames.
+    - length: Array of the number of frames of the particles.
+    - kind: Array of the type indexes of the particles.
+    - active: Array of flags telling whether a slot holds a particle.
+    - damaging: Array of flags telling whether a particle damages enemies.
+    - free: List of the free slots.
+    - dropped: Number of particles not spawned because the pool was full.
+
+    Methods:
+    - create_particles(animation_type, position, damaging): Spawn a particle effect.
+    - update(): Advance the animations of all particles by one simulation step.
+    - draw(surface, viewport): Draw the particles intersecting the viewport.
+    - damaging_rects(): Return the rects of the damaging particles.
+    - clear(): Remove all particles.
+    - __len__(): Return the number of particles.
+    """
+    def __init__(self, capacity = PARTICLE_CAPACITY):
+        """Load the frames of the available effect types and allocate the slots."""
+        self.types = {}
+        self.surfaces = []
+        first_frame = []
+        frame_count = []
+        for animation_type, folder in PARTICLE_FOLDERS.items():
+            frames = import_folder(folder) if path.isdir(folder) else []
+            if frames:
+                self.types[animation_type] = len(first_frame)
+                first_frame.append(len(self.surfaces))
+                frame_count.append(len(frames))
+                self.surfaces.extend(frames)
+        self.first_frame = np.array(first_frame, dtype = np.int32)
+        self.frame_count = np.array(frame_count, dtype = np.int32)
+        self.sizes = np.array([surface.get_size() for surface in self.surfaces], dtype = np.int32).reshape(-1, 2)
+
+        self.capacity = capacity
+        self.centers = np.zeros((capacity, 2), dtype = np.int32)
+        self.frame = np.zeros(capacity, dtype = np.float32)
+        self.length = np.zeros(capacity, dtype = np.float32)
+        self.kind = np.zeros(capacity, dtype = np.int32)
+        self.active = np.zeros(capacity, dtype = bool)
+        self.damaging = np.zeros(capacity, dtype = bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.dropped = 0
+
+    def __len__(self):
+        """Return the number of particles."""
+        return self.capacity - len(self.free)
+
+    def create_particles(self, animation_type, position, damaging = False):
+        """
+        Spawn a particle effect. Effect types without graphics are ignored.
+
+        Parameters:
+        - animation_type: Name of the effect, e.g. "flame" or "claw".
+        - position: Center of the effect in world coordinates.
+        - damaging: Boolean indicating whether the effect damages enemies.
+        """
+        kind = self.types.get(animation_type)
+        if kind is None:
+            return
+        if not self.free:
+            self.dropped += 1
+            return
+
+        slot = self.free.pop()
+        self.centers[slot] = (int(position[0]), int(position[1]))
+        self.frame[slot] = 0
+        self.length[slot] = self.frame_count[kind]
+        self.kind[slot] = kind
+        self.active[slot] = True
+        self.damaging[slot] = damaging
 
     def update(self):
-        self.animate()
\ No newline at end of file
+        """Advance the animations of all particles and free the finished ones."""
+        if len(self.free) == self.capacity:
+            return
+        self.frame[self.active] += PARTICLE_ANIMATION_SPEED
+        finished = np.flatnonzero(self.active & (self.frame >= self.length))
+        if len(finished):
+            self.active[finished] = False
+            self.damaging[finished] = False
+            self.free.extend(finished.tolist())
+
+    def rects(self, slots):
+        """
+        Return the current surface indexes and top-left corners of particles.
+
+        Parameters:
+        - slots: Array of particle slots.
+
+        Returns:
+        - Tuple of the array of surface indexes and the array of top-left corners.
+        """
+        surface_index = self.first_frame[self.kind[slots]] + self.frame[slots].astype(np.int32)
+        return surface_index, self.centers[slots] - self.sizes[surface_index] // 2
+
+    def draw(self, surface, viewport):
+        """
+        Draw the particles intersecting the viewport in a single blits call.
+
+        Parameters:
+        - surface: The surface to draw on.
+        - viewport: Rect of the world area shown on the surface.
+        """
+        if len(self.free) == self.capacity:
+            return
+        slots = np.flatnonzero(self.active)
+        # the largest frame is used as margin, so no partially visible particle is culled
+        margin = self.sizes.max(axis = 0) // 2 + 1
+        centers = self.centers[slots]
+        visible = ((centers[:, 0] >= viewport.left - margin[0]) & (centers[:, 0] < viewport.right + margin[0]) &
+                   (centers[:, 1] >= viewport.top - margin[1]) & (centers[:, 1] < viewport.bottom + margin[1]))
+        surface_index, topleft = self.rects(slots[visible])
+        topleft -= viewport.topleft
+
+        surfaces = self.surfaces
+        surface.blits([(surfaces[index], position) for index, position
+                       in zip(surface_index.tolist(), topleft.tolist())], doreturn = False)
+
+    def damaging_rects(self):
+        """
+        Return the rects of the damaging particles.
+
+        Returns:
+        - List of Pygame Rects in world coordinates.
+        """
+        slots = np.flatnonzero(self.damaging)
+        if not len(slots):
+            return []
+        surface_index, topleft = self.rects(slots)
+        return [pygame.Rect(rect) for rect in np.hstack((topleft, self.sizes[surface_index])).tolist()]
+
+    def clear(self):
+        """Remove all particles, e.g. when the level changes."""
+        self.active[:] = False
+        self.damaging[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
@@ -1,6 +1,6 @@
 import pygame
 from settings import *
-from helpers import import_folder
+from helpers import import_folder, import_image
 from entity import Entity
 
 class Player(Entity):
@@ -21,8 +21,10 @@ class Player(Entity):
     - magic_switch_time: The time at which the player switched magic abilities.
     - attacking: A boolean indicating whether the player is currently performing an attack.
     - attack_time: The time at which the player initiated the attack.
-    - obstacle_sprites: The sprite group representing obstacle sprites in the game.
-    - cooldown: A dictionary containing cooldown times for various actions.
+    - obstacle_grid: The occupancy grid of the obstacle sprites in the game.
+    - controls: The input source the key presses are read from.
+    - timers: The TimerScheduler ending the attacks and cooldowns.
+    - cooldown: A dictionary containing cooldown times in milliseconds for various actions.
     - stats: A dictionary containing the player's statistics (e.g., health, energy, attack).
     - health: The current health points of the player.
     - energy: The current energy points of the player.
@@ -39,7 +41,11 @@ class Player(Entity):
     Methods:
     - input(): Handle player input for movement and actions.
     - import_player_assets(): Load player animations from files.
-    - cooldowns(): Manage cooldowns for player actions.
+    - start_attack(): Start an attack and schedule its end.
+    - end_attack(): End the current attack.
+    - allow_magic_switch(): End the cooldown of switching magic.
+    - start_invincibility(): Make the player invulnerable for a while after being hit.
+    - end_invincibility(): Make the player vulnerable again.
     - get_full_weapon_damage(): Calculate the total damage including the player's attack and weapon damage.
     - get_full_magic_damage(): Calculate the total damage including the player's magic strength.
     - energy_recovery(): Handle energy recovery over time.
@@ -48,20 +54,22 @@ class Player(Entity):
     - move_to(): Move the player character to a specified position.
     - update(): Update the player's state and behavior.
     """
-    def __init__(self, position, groups, obstacle_sprites, create_attack, destroy_attack, create_magic):
+    def __init__(self, position, groups, obstacle_grid, create_attack, destroy_attack, create_magic, controls, timers):
         """
         Initialize the Player object with the given position and attributes.
 
         Parameters:
         - position: The initial position of the player character.
         - groups: The sprite groups to which the player belongs.
-        - obstacle_sprites: The sprite group representing obstacle sprites in the game.
+        - obstacle_grid: The occupancy grid of the obstacle sprites in the game.
         - create_attack: A function to create physical attacks.
         - destroy_attack: A function to destroy physical attacks.
         - create_magic: A function to create magical effects.
+        - controls: The input source, e.g. KeyboardInput or ScriptedInput.
+        - timers: The TimerScheduler on simulation time.
         """
         super().__init__(groups)
-        self.image = pygame.image.load('assets/player/down/down_1.png').convert_alpha()
+        self.image = import_image('assets/player/down/down_1.png')
         self.rect = self.image.get_rect(topleft = position)
         
         # the hitbox is smaller than the rectangle to create illusion of depth by showing
@@ -82,7 +90,9 @@ class Player(Entity):
         self.attacking = False
         self.attack_time = None
 
-        self.obstacle_sprites = obstacle_sprites
+        self.obstacle_grid = obstacle_grid
+        self.controls = controls
+        self.timers = timers
         self.cooldown = {
             "attack" : 300,
             "invincibility" : 500,
@@ -104,7 +114,7 @@ class Player(Entity):
     def input(self):
         """Handle player input for movement and actions."""
         if not self.attacking:
-            keys = pygame.key.get_pressed()
+            keys = self.controls.get_pressed()
 
             # movement input
             if keys[pygame.K_UP]:
@@ -126,13 +136,11 @@ class Player(Entity):
                 self.direction.x = 0
 
             if keys[pygame.K_SPACE]:
-                self.attacking = True
-                self.attack_time = pygame.time.get_ticks()
+                self.start_attack()
                 self.create_attack()
 
             if keys[pygame.K_w]:
-                self.attacking = True
-                self.attack_time = pygame.time.get_ticks()
+                self.start_attack()
                 style = list(magic_data.keys())[self.magic_index]
                 strength = list(magic_data.values())[self.magic_index]["strength"] + self.stats["magic"]
                 cost = list(magic_data.values())[self.magic_index]["cost"]                
@@ -140,7 +148,8 @@ class Player(Entity):
             
             if keys[pygame.K_q] and self.can_switch_magic:
                 self.can_switch_magic = False
-                self.magic_switch_time = pygame.time.get_ticks()
+                self.magic_switch_time = self.timers.time
+                self.timers.schedule(self.cooldown["switch_magic"], self.allow_magic_switch)
                 if self.magic_index < len(list(magic_data.keys())) - 1:
                     self.magic_index += 1
                 else:
@@ -170,22 +179,30 @@ class Player(Entity):
             full_path = character_path + animation
             self.animations[animation] = import_folder(full_path)
 
-    def cooldowns(self):
-        """Manage cooldowns for player actions."""
-        current_time = pygame.time.get_ticks()
+    def start_attack(self):
+        """Start an attack and schedule its end once the attack cooldown has passed."""
+        self.attacking = True
+        self.attack_time = self.timers.time
+        self.timers.schedule(self.cooldown["attack"] + weapon_data["sword"]["cooldown"], self.end_attack)
 
-        if self.attacking:
-            if current_time - self.attack_time >= self.cooldown["attack"] +  weapon_data["sword"]["cooldown"]:
-                self.attacking = False
-                self.destroy_attack()
+    def end_attack(self):
+        """End the current attack and remove the weapon."""
+        self.attacking = False
+        self.destroy_attack()
 
-        if not self.can_switch_magic:
-            if current_time - self.magic_switch_time >= self.cooldown["switch_magic"]:
-                self.can_switch_magic = True
+    def allow_magic_switch(self):
+        """End the cooldown of switching magic."""
+        self.can_switch_magic = True
 
-        if not self.vulnerable:
-            if current_time - self.hurt_time >= self.cooldown["invincibility"]:
-                self.vulnerable = True
+    def start_invincibility(self):
+        """Make the player invulnerable for a while after being hit."""
+        self.vulnerable = False
+        self.hurt_time = self.timers.time
+        self.timers.schedule(self.cooldown["invincibility"], self.end_invincibility)
+
+    def end_invincibility(self):
+        """Make the player vulnerable again."""
+        self.vulnerable = True
 
     def get_full_weapon_damage(self):
         """
@@ -266,7 +283,6 @@ class Player(Entity):
     def update(self):
         """Update the player's state and behavior."""
         self.input()
-        self.cooldowns()
         self.get_status()
         self.animate()
         self.move(self.speed)
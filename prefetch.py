@@ -0,0 +1,115 @@
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from settings import *
+from level_compiler import load_level, compile_floor, floor_chunk_path
+
+
+def read_level(map_number, from_map = None):
+    """
+    Read and decode everything a level needs from disk. Runs in a worker
+    thread, so the floor chunks around the entry point are only decoded
+    here and converted later on the main thread.
+
+    Parameters:
+    - map_number: Integer representing the index of the level map.
+    - from_map: Integer representing the index of the map the player
+    will come from, or None if the entry point is unknown.
+
+    Returns:
+    - Tuple of the CompiledLevel and a dictionary mapping (column, row)
+    to the decoded floor chunks around the entry point.
+    """
+    level_data = load_level(map_number)
+    chunks = {}
+    position = level_data.entry_position(from_map) if from_map is not None else None
+    if compile_floor(map_number) and position:
+        # decode the chunks a screen around the entry point
+        size = FLOOR_CHUNK_SIZE
+        area = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        area.center = position
+        area = area.clip(pygame.Rect(0, 0, level_data.width, level_data.height))
+        for row in range(area.top // size, (area.bottom - 1) // size + 1):
+            for col in range(area.left // size, (area.right - 1) // size + 1):
+                chunks[(col, row)] = pygame.image.load(floor_chunk_path(map_number, col, row))
+    return level_data, chunks
+
+
+class LevelPrefetcher:
+    """
+    Background loader reading the maps linked from the current level,
+    so a map transition only has to build the sprites.
+
+    Parameters:
+    - workers: Number of worker threads.
+
+    Attributes:
+    - executor: ThreadPoolExecutor running the reads.
+    - pending: Dictionary mapping a map number to the Future of its read.
+
+    Methods:
+    - prefetch(map_numbers, from_map): Start reading the given maps
+    in the background and drop the reads of maps no longer linked that
+    have not started yet.
+    - is_ready(map_number): Return whether a map has been read.
+    - take(map_number): Return the read data of a map, waiting for
+    it or reading it synchronously if needed.
+    """
+    def __init__(self, workers = PREFETCH_WORKERS):
+        """
+        Initialize the prefetcher with its worker threads.
+
+        Parameters:
+        - workers: Number of worker threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "prefetch")
+        self.pending = {}
+
+    def prefetch(self, map_numbers, from_map = None):
+        """
+        Start reading the given maps in the background.
+
+        Parameters:
+        - map_numbers: Iterable of map numbers linked from the current level.
+        - from_map: Integer representing the index of the current map, which
+        is where the player will enter the prefetched maps from.
+        """
+        map_numbers = set(map_numbers)
+        for map_number, future in list(self.pending.items()):
+            # a read that already started cannot be cancelled; it is kept so a
+            # later request for the map reuses it instead of compiling it twice
+            if map_number not in map_numbers and (future.cancel() or future.done()):
+                del self.pending[map_number]
+
+        for map_number in map_numbers:
+            if map_number not in self.pending:
+                self.pending[map_number] = self.executor.submit(read_level, map_number, from_map)
+
+    def is_ready(self, map_number):
+        """
+        Return whether a map has been read in the background.
+
+        Parameters:
+        - map_number: Integer representing the index of the level map.
+        """
+        future = self.pending.get(map_number)
+        return future is not None and future.done()
+
+    def take(self, map_number):
+        """
+        Return the data of a map, waiting for its background read if it
+        is still running or reading it now if it was never requested.
+
+        Parameters:
+        - map_number: Integer representing the index of the level map.
+
+        Returns:
+        - Tuple of the CompiledLevel and the decoded floor chunks.
+        """
+        future = self.pending.pop(map_number, None)
+        if future is None:
+            return read_level(map_number)
+        try:
+            return future.result()
+        except (pygame.error, OSError):
+            # a chunk could not be read or decoded in the background, read it again here
+            return read_level(map_number)
@@ -0,0 +1,141 @@
+import numpy as np
+from collections import deque
+from time import perf_counter
+
+
+class PhaseTimer:
+    """
+    Context manager adding the time spent in its block to a phase of the
+    current frame of a FrameProfiler.
+
+    Parameters:
+    - profiler: Instance of FrameProfiler.
+    - phase: Name of the measured phase.
+    """
+    def __init__(self, profiler, phase):
+        """Initialize the timer for the given phase."""
+        self.profiler = profiler
+        self.phase = phase
+        self.start = 0
+
+    def __enter__(self):
+        """Start measuring."""
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop measuring and record the elapsed time."""
+        self.profiler.add(self.phase, perf_counter() - self.start)
+        return False
+
+
+class NullTimer:
+    """Context manager doing nothing, used while profiling is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class FrameProfiler:
+    """
+    Collects the time spent in the phases of each frame (drawing, sprite
+    updates, enemy AI, ...) and summarizes them over the recorded frames.
+
+    While disabled, measure() returns a shared no-op context manager, so the
+    instrumented code costs almost nothing.
+
+    Parameters:
+    - enabled: Boolean indicating whether the phases are measured.
+    - history: Maximum number of recorded frames, None for no limit.
+
+    Attributes:
+    - enabled: Boolean indicating whether the phases are measured.
+    - current: Dictionary mapping the phases of the running frame to their
+    time in seconds.
+    - frames: Deque of the phase dictionaries of the finished frames.
+    - phases: List of all phase names seen so far, in order of appearance.
+
+    Methods:
+    - measure(phase): Return a context manager timing a block as the phase.
+    - add(phase, seconds): Add time to a phase of the running frame.
+    - end_frame(): Finish the running frame and start a new one.
+    - samples(phase): Return the times of a phase over the recorded frames.
+    - summary(): Return statistics of every phase over the recorded frames.
+    - reset(): Drop all recorded frames.
+    """
+    def __init__(self, enabled = False, history = None):
+        """Initialize an empty profiler."""
+        self.enabled = enabled
+        self.current = {}
+        self.frames = deque(maxlen = history)
+        self.phases = []
+
+    def measure(self, phase):
+        """
+        Return a context manager timing a block as the given phase.
+
+        Parameters:
+        - phase: Name of the phase, e.g. "custom_draw".
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return PhaseTimer(self, phase)
+
+    def add(self, phase, seconds):
+        """Add time in seconds to a phase of the running frame."""
+        if phase not in self.current:
+            self.current[phase] = 0
+            if phase not in self.phases:
+                self.phases.append(phase)
+        self.current[phase] += seconds
+
+    def end_frame(self):
+        """Finish the running frame and start a new one."""
+        if self.enabled:
+            self.frames.append(self.current)
+            self.current = {}
+
+    def samples(self, phase):
+        """
+        Return the times of a phase over the recorded frames.
+
+        Parameters:
+        - phase: Name of the phase.
+
+        Returns:
+        - List of times in seconds, 0 for frames without the phase.
+        """
+        return [frame.get(phase, 0) for frame in self.frames]
+
+    def summary(self):
+        """
+        Return statistics of every phase over the recorded frames.
+
+        Returns:
+        - Dictionary mapping each phase to a dictionary with the mean, p50,
+        p95, p99 and max of its time in milliseconds.
+        """
+        result = {}
+        for phase in self.phases:
+            values = np.array(self.samples(phase)) * 1000
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            result[phase] = {
+                "mean" : float(values.mean()),
+                "p50" : float(p50),
+                "p95" : float(p95),
+                "p99" : float(p99),
+                "max" : float(values.max())
+            }
+        return result
+
+    def reset(self):
+        """Drop all recorded frames."""
+        self.current = {}
+        self.frames.clear()
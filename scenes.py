@@ -0,0 +1,277 @@
+import pygame
+from settings import *
+from timers import TimerScheduler
+
+
+class Scene:
+    """
+    A screen of the game driven by the main loop through a SceneStack,
+    e.g. the world, a mini-game or an overlay.
+
+    Subclasses override handle_event, update and draw. None of them may
+    block: waiting is done with a timer of the stack's scheduler.
+
+    Parameters:
+    - on_end: Optional function called with the scene when it finishes.
+
+    Attributes:
+    - modal: Boolean indicating whether the scenes below receive no
+    events and no updates while this scene is on the stack.
+    - opaque: Boolean indicating whether the scene covers the whole
+    screen, so the scenes below are not drawn.
+    - stack: The SceneStack the scene is on, or None.
+    - invalid: Boolean indicating whether the next draw has to redraw
+    the whole screen instead of only the changed parts.
+    - on_end: Function called with the scene when it finishes, or None.
+
+    Methods:
+    - invalidate(): Request a full redraw on the next draw.
+    - handle_event(event): Handle an input event.
+    - update(): Advance the scene by one simulation step.
+    - draw(alpha): Draw the scene.
+    - finish(): Remove the scene from its stack and notify on_end, once.
+    """
+    modal = True
+    opaque = True
+
+    def __init__(self, on_end = None):
+        """Initialize a scene that is not on a stack yet."""
+        self.stack = None
+        self.invalid = True
+        self.on_end = on_end
+
+    def invalidate(self):
+        """Request a full redraw on the next draw."""
+        self.invalid = True
+
+    def handle_event(self, event):
+        """
+        Handle an input event.
+
+        Parameters:
+        - event: The Pygame event.
+
+        Returns:
+        - True if the event was consumed and must not reach the scenes below.
+        """
+        return False
+
+    def update(self):
+        """Advance the scene by one simulation step."""
+        pass
+
+    def draw(self, alpha = 1.0):
+        """
+        Draw the scene onto the display surface.
+
+        Parameters:
+        - alpha: Fraction of a simulation step elapsed since the last update.
+
+        Returns:
+        - List of the changed screen rects, or None if the whole screen changed.
+        """
+        return None
+
+    def finish(self):
+        """
+        Remove the scene from its stack and notify on_end. Finishing a
+        scene that is not on a stack does nothing.
+        """
+        if self.stack is None:
+            return
+        self.stack.remove(self)
+        if self.on_end:
+            self.on_end(self)
+
+
+class SceneStack:
+    """
+    Stack of the scenes of the game. Events go to the scenes from the top
+    down until one consumes them or a modal scene is reached, updates run
+    for the scenes down to the topmost modal one, and drawing starts at the
+    topmost opaque scene.
+
+    The stack also owns the simulation clock of the mini-games and overlays:
+    every update advances its TimerScheduler by one fixed simulation step
+    before the scenes run. The world keeps a clock of its own, advanced by
+    its scene, so it stays paused together with the world under a modal scene.
+
+    Parameters:
+    - step: Duration of a simulation step in milliseconds.
+
+    Attributes:
+    - scenes: List of the scenes, bottom first.
+    - step: Duration of a simulation step in milliseconds.
+    - timers: TimerScheduler on simulation time of the stacked scenes.
+
+    Methods:
+    - push(scene): Put a scene on top of the stack.
+    - remove(scene): Take a scene off the stack.
+    - active_scenes(): Return the scenes that receive updates.
+    - visible_scenes(): Return the scenes that are drawn.
+    - handle_event(event): Pass an input event to the scenes.
+    - update(): Advance the clock and the active scenes by one simulation step.
+    - draw(alpha): Draw the visible scenes.
+    """
+    def __init__(self, step = 1000 / SIMULATION_RATE):
+        """Initialize an empty stack with its clock at 0."""
+        self.scenes = []
+        self.step = step
+        self.timers = TimerScheduler()
+
+    def __len__(self):
+        """Return the number of scenes."""
+        return len(self.scenes)
+
+    def __contains__(self, scene):
+        """Return whether a scene is on the stack."""
+        return scene in self.scenes
+
+    @property
+    def top(self):
+        """The scene on top of the stack, or None."""
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        """
+        Put a scene on top of the stack.
+
+        Parameters:
+        - scene: Instance of a Scene subclass.
+        """
+        scene.stack = self
+        scene.invalidate()
+        self.scenes.append(scene)
+
+    def remove(self, scene):
+        """
+        Take a scene off the stack. The remaining scenes redraw fully,
+        because the removed one may have covered them.
+
+        Parameters:
+        - scene: Instance of a Scene subclass on the stack.
+        """
+        self.scenes.remove(scene)
+        scene.stack = None
+        for remaining in self.scenes:
+            remaining.invalidate()
+
+    def active_scenes(self):
+        """Return the scenes down to the topmost modal one, bottom first."""
+        for index in range(len(self.scenes) - 1, -1, -1):
+            if self.scenes[index].modal:
+                return self.scenes[index:]
+        return list(self.scenes)
+
+    def visible_scenes(self):
+        """Return the scenes from the topmost opaque one upwards, bottom first."""
+        for index in range(len(self.scenes) - 1, -1, -1):
+            if self.scenes[index].opaque:
+                return self.scenes[index:]
+        return list(self.scenes)
+
+    def handle_event(self, event):
+        """
+        Pass an input event to the scenes from the top down until one
+        consumes it or a modal scene has handled it.
+
+        Parameters:
+        - event: The Pygame event.
+        """
+        for scene in reversed(list(self.scenes)):
+            if scene.handle_event(event) or scene.modal:
+                break
+
+    def update(self):
+        """Advance the clock and the active scenes by one simulation step."""
+        self.timers.advance(self.step)
+        for scene in self.active_scenes():
+            if scene.stack is self:
+                scene.update()
+
+    def draw(self, alpha = 1.0):
+        """
+        Draw the visible scenes.
+
+        Parameters:
+        - alpha: Fraction of a simulation step elapsed since the last update.
+
+        Returns:
+        - List of the changed screen rects, or None if the whole screen changed.
+        """
+        visible = self.visible_scenes()
+        # stacked scenes paint over each other, so partial redraws only work for a single scene
+        if len(visible) > 1:
+            for scene in visible:
+                scene.invalidate()
+
+        dirty_rects = []
+        for scene in visible:
+            rects = scene.draw(alpha)
+            if rects is None:
+                dirty_rects = None
+            elif dirty_rects is not None:
+                dirty_rects.extend(rects)
+        return dirty_rects
+
+
+class WorldScene(Scene):
+    """
+    Scene of the game world, running and drawing the current level.
+
+    Parameters:
+    - world: Instance of the World class.
+
+    Attributes:
+    - world: Instance of the World class.
+    - display_surface: The display surface.
+    """
+    def __init__(self, world):
+        """Initialize the scene for the given world."""
+        super().__init__()
+        self.world = world
+        self.display_surface = pygame.display.get_surface()
+
+    def handle_event(self, event):
+        """Open a treasure with E."""
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_e:
+            self.world.start_mini_game()
+            return True
+        return False
+
+    def update(self):
+        """Advance the clock of the world and the current level by one simulation step."""
+        self.world.timers.advance(self.stack.step)
+        self.world.level.update()
+
+    def draw(self, alpha = 1.0):
+        """Draw the current level and the HUD."""
+        self.display_surface.fill("black")
+        self.world.level.draw(alpha)
+        return None
+
+
+class OverlayScene(Scene):
+    """
+    Transparent scene drawing the performance overlay of the HUD
+    on top of the other scenes.
+
+    Parameters:
+    - world: Instance of the World class.
+
+    Attributes:
+    - world: Instance of the World class.
+    """
+    modal = False
+    opaque = False
+
+    def __init__(self, world):
+        """Initialize the overlay for the given world."""
+        super().__init__()
+        self.world = world
+
+    def draw(self, alpha = 1.0):
+        """Draw the performance overlay of the current level."""
+        level = self.world.level
+        level.hud.show_overlay(level, self.world.profiler)
+        return None
@@ -3,6 +3,53 @@ HEIGHT = 720
 FPS = 60
 TILESIZE = 64
 
+# the game logic advances in fixed steps of 1 / SIMULATION_RATE seconds, independent
+# of the frame rate; after a stall at most MAX_SIMULATION_STEPS steps are caught up
+SIMULATION_RATE = 60
+MAX_SIMULATION_STEPS = 5
+
+# number of previously visited levels kept in memory for reuse
+LEVEL_CACHE_SIZE = 3
+# worker threads reading the maps linked from the current level
+PREFETCH_WORKERS = 2
+
+# the floor of a level is split into square chunks, only the ones near the camera stay loaded
+FLOOR_CHUNK_SIZE = 512
+FLOOR_CHUNK_CAPACITY = 24
+
+# enemy simulation level of detail: full updates near the player, reduced-rate
+# AI without animation up to the wake radius, no updates at all beyond it
+LOD_NEAR_RADIUS = 800
+LOD_WAKE_RADIUS = 1400
+LOD_REDUCED_INTERVAL = 4
+
+# enemy AI decisions are spread over frames within this time budget,
+# at least AI_MIN_DECISIONS enemies decide in every frame
+AI_BUDGET_MS = 2.0
+AI_MIN_DECISIONS = 8
+
+# particle effects live in a fixed pool, spawns beyond its capacity are dropped
+PARTICLE_CAPACITY = 1024
+PARTICLE_ANIMATION_SPEED = 0.15
+
+# cell size of the spatial hashes indexing the damaging and damageable sprites
+SPATIAL_HASH_CELL_SIZE = 128
+
+# moving enemies closer than SEPARATION_RADIUS steer away from each other, considering
+# at most SEPARATION_NEIGHBOURS neighbours; the steering is capped at SEPARATION_STRENGTH
+# times the length of the chase direction, so crowds spread out instead of stacking up
+SEPARATION_RADIUS = 64
+SEPARATION_NEIGHBOURS = 8
+SEPARATION_STRENGTH = 2
+
+# chasing enemies follow a flow field towards the tile of the player, rebuilt
+# with at most FLOW_FIELD_WAVES breadth-first waves per simulation step and
+# reaching FLOW_FIELD_RADIUS tiles of path length, beyond that enemies go straight
+FLOW_FIELD_WAVES = 8
+FLOW_FIELD_RADIUS = 24
+# enemies clipping the corner of an obstacle by at most this many pixels slide past it
+ENEMY_CORNER_TOLERANCE = 16
+
 
 BAR_HEIGHT = 20
 HEALTH_BAR_WIDTH = 200
@@ -11,6 +58,13 @@ ITEM_BOX_SIZE = 80
 UI_FONT = "assets/font/joystix.ttf"
 UI_FONT_SIZE = 18
 
+# performance overlay toggled with F3, showing the last PERF_HISTORY frames
+PERF_HISTORY = 120
+PERF_FONT_SIZE = 10
+PERF_OVERLAY_WIDTH = 380
+PERF_GRAPH_HEIGHT = 60
+PERF_GRAPH_MAX_MS = 50
+
 UI_BG_COLOR = "#222222"
 UI_BORDER_COLOR = "#111111"
 TEXT_COLOR = "#EEEEEE"
@@ -2,35 +2,51 @@ import pygame
 from random import choice, randint
 import textwrap
 from settings import *
+from helpers import import_image
+from scenes import Scene
 
 TILE_SIZE = 200
 TILE_NUM = 3
 PUZZLE_SIZE = TILE_SIZE * TILE_NUM
+# the final board stays on the screen for a moment before the game ends
+END_DELAY = 800
 
-class Game:
+class Game(Scene):
     """
-    Initialize the game and manage the puzzle-solving process.
+    Initialize the game and manage the puzzle-solving process,
+    played as a scene on top of the world.
 
     Parameters:
     - world: The instance of the game world.
+    - on_end: Optional function called with the game when it finishes.
 
     Attributes:
     - screen: The Pygame surface for rendering.
-    - clock: Pygame clock object for controlling the frame rate.
     - world: The instance of the game world.
     - font: The font used for rendering text.
+    - background: Pre-rendered static layer with the reference image and
+    the instructions, built once per game.
+    - frame: The Frame holding the tiles.
+    - end_timer: Timer of the scene stack finishing the game, None while
+    it is being played.
     """
-    def __init__(self, world):
+    def __init__(self, world, on_end = None):
         """
         Initialize the game with the given world instance.
 
         Parameters:
         - world: The instance of the game world.
+        - on_end: Optional function called with the game when it finishes.
         """
+        super().__init__(on_end)
         self.screen = pygame.display.get_surface()
-        self.clock = pygame.time.Clock()
         self.world = world
         self.font = pygame.font.SysFont(UI_FONT, 32)
+        self.end_timer = None
+
+        self.create_tiles()
+        self.build_background()
+        self.frame = Frame(self, self.tiles)
 
     def create_tiles(self):
         """
@@ -42,7 +58,7 @@ class Game:
         - reference_image: The scaled reference image.
         - tiles: List containing Tile instances.
         """
-        self.image = pygame.image.load(f'assets/sliding_puzzle/{randint(0,7)}.jpg')
+        self.image = import_image(f'assets/sliding_puzzle/{randint(0,7)}.jpg', alpha = False)
         self.image = pygame.transform.scale(self.image, (PUZZLE_SIZE, PUZZLE_SIZE))
         self.reference_image = self.image
         self.reference_image = pygame.transform.scale(self.reference_image, (PUZZLE_SIZE/2, PUZZLE_SIZE/2))
@@ -52,38 +68,62 @@ class Game:
                 tile = self.image.subsurface(j * TILE_SIZE, i * TILE_SIZE, TILE_SIZE, TILE_SIZE)
                 self.tiles.append(Tile(self, tile, i, j))
 
-    def run(self):
+    def build_background(self):
+        """
+        Render the static layer of the game: the white background, the
+        reference image and the wrapped instructions.
+        """
+        self.background = pygame.Surface(self.screen.get_size())
+        self.background.fill((255, 255, 255))
+        self.background.blit(self.reference_image, (10, (self.screen.get_height() - PUZZLE_SIZE) // 2))
+
+        lines = textwrap.wrap(f'You can move the tiles with the arrows and forfeit the game with Escape.', 30)
+        y_offset = 0
+        for line in lines:
+            text = self.font.render(line, True, (0, 0, 0))
+            self.background.blit(text, (10, (self.screen.get_height() - PUZZLE_SIZE) // 2 + PUZZLE_SIZE // 2 + 10 + y_offset))
+            y_offset += text.get_height()
+
+    def handle_event(self, event):
         """
-        Run the sliding puzzle game loop.
+        Handle the input of the game.
 
         Events:
         - Arrow keys: Move the tiles.
         - Space: Shuffle the puzzle.
         - Escape: End the game.
+
+        Returns:
+        - True, the game consumes all events.
         """
-        self.create_tiles()
-        self.frame = Frame(self, self.tiles)
-        self.running = True
-        while self.running:
-            self.clock.tick(60)
-            self.frame.draw(self.screen)
-            self.screen.blit(self.reference_image, (10, (self.screen.get_height() - PUZZLE_SIZE) // 2))
+        if self.end_timer is None:
+            self.frame.handle_event(event)
+        return True
 
-            lines = textwrap.wrap(f'You can move the tiles with the arrows and forfeit the game with Escape.', 30)
-            y_offset = 0
-            for line in lines:
-                text = self.font.render(line, True, (0, 0, 0))
-                self.screen.blit(text, (10, (self.screen.get_height() - PUZZLE_SIZE) // 2 + PUZZLE_SIZE // 2 + 10 + y_offset))
-                y_offset += text.get_height()
+    def draw(self, alpha = 1.0):
+        """
+        Draw the whole screen when the scene was invalidated, otherwise
+        only the board after a tile moved.
+
+        Parameters:
+        - alpha: Fraction of a simulation step, unused.
 
-            for event in pygame.event.get():
-                self.frame.handle_event(event)
-            pygame.display.flip()
+        Returns:
+        - List of the changed screen rects, or None if the whole screen changed.
+        """
+        if self.invalid:
+            self.invalid = False
+            self.screen.blit(self.background, (0, 0))
+            self.frame.draw(self.screen)
+            return None
+        if self.frame.dirty:
+            return self.frame.draw(self.screen)
+        return []
 
     def end_game(self):
-        """End the sliding puzzle game."""
-        pygame.time.wait(800)
-        self.running = False
+        """End the sliding puzzle game after a short delay."""
+        if self.end_timer is None:
+            self.end_timer = self.stack.timers.schedule(END_DELAY, self.finish)
         self.world.solved_mini_game = self.frame.solved
 
 
@@ -160,6 +200,9 @@ class Frame:
     - moves: The number of moves made by the player.
     - solved: A boolean indicating whether the puzzle has been solved.
     - font: The font used for rendering text.
+    - dirty: A boolean indicating whether the board changed since it was last drawn.
+    - board_rect: The screen area of the puzzle board.
+    - text_rect: The screen area covered by the last drawn moves text.
     """
     def __init__(self, game, tiles):
         """Initialize the frame(grid) for the sliding puzzle."""
@@ -169,20 +212,36 @@ class Frame:
         self.shuffling = False
         self.moves = 0
         self.solved = False
+        self.dirty = True
         self.font = pygame.font.SysFont('Arial', 32)
         self.shuffle()
         self.game = game
+        self.board_rect = pygame.Rect(tiles[0].puzzle_x, tiles[0].puzzle_y, PUZZLE_SIZE, PUZZLE_SIZE)
+        self.text_rect = pygame.Rect(10, 10, 0, 0)
 
     def draw(self, screen):
-        """Draw the frame on the screen."""
-        screen.fill((255, 255, 255))
+        """
+        Draw the board and the moves text over the static layer.
+
+        Parameters:
+        - screen: The Pygame surface for rendering.
+
+        Returns:
+        - List of the screen areas that were redrawn.
+        """
+        background = self.game.background
+        screen.blit(background, self.board_rect, self.board_rect)
+        screen.blit(background, self.text_rect, self.text_rect)
+        dirty_rects = [self.board_rect, self.text_rect]
         if self.solved:
             for tile in self.tiles:
                 tile.draw(screen)
         else:
             for tile in self.tiles[:-1]:
                 tile.draw(screen)
-        self.draw_text(screen)
+        dirty_rects.extend(self.draw_text(screen))
+        self.dirty = False
+        return dirty_rects
 
     def draw_text(self, screen):
         """
@@ -191,13 +250,17 @@ class Frame:
 
         Parameters:
         - screen: The Pygame surface for rendering.
+
+        Returns:
+        - List of the screen areas covered by the text.
         """
         text = self.font.render(f'Moves: {self.moves}', True, (0, 0, 0))
-        screen.blit(text, (10, 10))
+        self.text_rect = screen.blit(text, (10, 10))
+        text_rects = [self.text_rect]
         if self.solved:
             text = self.font.render('You solved the puzzle!', True, (0, 0, 0))
-            screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, screen.get_height() // 2 - text.get_height() // 2))
-            self.game.running = False
+            text_rects.append(screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, screen.get_height() // 2 - text.get_height() // 2)))
+        return text_rects
 
     def shuffle(self):
         """
@@ -210,6 +273,7 @@ class Frame:
         self.shuffling = False
         self.moves = 0
         self.solved = False
+        self.dirty = True
 
     def move_tile(self, direction, shuffle=False):
         """
@@ -240,6 +304,7 @@ class Frame:
                     self.empty_row = row
                     self.empty_col = col
                     if not shuffle:
+                        self.dirty = True
                         self.moves += 1
                         self.check_solution()
                     break
@@ -254,8 +319,7 @@ class Frame:
             if tile.row != row or tile.col != col:
                 return
         self.solved = True
-        self.draw(self.game.screen)
-        pygame.display.flip()
+        self.dirty = True
         self.game.end_game()
 
     def handle_event(self, event):
@@ -0,0 +1,172 @@
+import pygame
+from settings import *
+
+
+class SpatialHash(pygame.sprite.Group):
+    """
+    Sprite group that also indexes its moving sprites in a uniform grid
+    of cells, so "which sprites are near this rect" queries only look at
+    the sprites in the cells the rect touches instead of the whole group.
+
+    Unlike the OccupancyGrid of the static obstacles, sprites move between
+    cells: a sprite has to call relocate after moving, which only touches
+    the cells when the range of cells covered by its rect changed. Sprites
+    joining the group before they have a rect (entities are added to their
+    groups first) are indexed on their first relocate.
+
+    Parameters:
+    - cell_size: Size of a cell in pixels. Defaults to SPATIAL_HASH_CELL_SIZE.
+
+    Attributes:
+    - cell_size: Size of a cell in pixels.
+    - cells: Dictionary mapping (column, row) tuples to dictionaries of
+    the sprites overlapping that cell.
+    - spans: Dictionary mapping each indexed sprite to the (left column,
+    top row, right column, bottom row) range of cells it covers.
+    - queries: Number of queries since the counters were last reset.
+    - candidates: Number of sprites returned by the queries since the
+    counters were last reset. Lookups through nearby are not counted.
+
+    Methods:
+    - span(rect): Return the range of cells covered by a rect.
+    - insert(sprite, span): Register a sprite in the cells of a span.
+    - discard(sprite): Remove a sprite from its cells.
+    - relocate(sprite): Update the cells of a sprite after it moved.
+    - nearby(rect): Return the sprites in the cells covered by a rect, uncounted.
+    - query(rect): Return the sprites in the cells covered by a rect.
+    - collide(rect): Return the sprites whose rect intersects a rect.
+    - reset_counters(): Reset the query and candidate counters.
+    """
+    def __init__(self, cell_size = SPATIAL_HASH_CELL_SIZE):
+        """
+        Initialize an empty spatial hash.
+
+        Parameters:
+        - cell_size: Size of a cell in pixels.
+        """
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells = {}
+        self.spans = {}
+        self.queries = 0
+        self.candidates = 0
+
+    def span(self, rect):
+        """
+        Return the range of cells covered by a rect.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - Tuple of the left column, top row, right column and bottom row.
+        """
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def insert(self, sprite, span):
+        """Register a sprite in every cell of a span."""
+        left, top, right, bottom = span
+        cells = self.cells
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                cell = cells.get((col, row))
+                if cell is None:
+                    cell = cells[(col, row)] = {}
+                cell[sprite] = None
+        self.spans[sprite] = span
+
+    def discard(self, sprite):
+        """Remove a sprite from the cells it was registered in."""
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+        left, top, right, bottom = span
+        cells = self.cells
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                cell = cells[(col, row)]
+                del cell[sprite]
+                if not cell:
+                    del cells[(col, row)]
+
+    def add_internal(self, sprite, layer = None):
+        """Add a sprite to the group and index it if it already has a rect."""
+        super().add_internal(sprite)
+        if getattr(sprite, "rect", None) is not None:
+            self.insert(sprite, self.span(sprite.rect))
+
+    def remove_internal(self, sprite):
+        """Remove a sprite from the group and from its cells."""
+        super().remove_internal(sprite)
+        self.discard(sprite)
+
+    def relocate(self, sprite):
+        """
+        Update the cells of a sprite after it moved.
+
+        Parameters:
+        - sprite: Sprite of the group with a rect attribute.
+        """
+        # called for every moving sprite on every step, so the span is computed inline
+        rect = sprite.rect
+        size = self.cell_size
+        span = (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+        if self.spans.get(sprite) != span:
+            self.discard(sprite)
+            self.insert(sprite, span)
+
+    def nearby(self, rect):
+        """
+        Return the sprites in the cells covered by a rect, which may or
+        may not intersect it, without counting the lookup, e.g. for the
+        neighbour searches of the crowd steering.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - List of sprites, each listed once.
+        """
+        left, top, right, bottom = self.span(rect)
+        cells = self.cells
+        found = {}
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                cell = cells.get((col, row))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def query(self, rect):
+        """
+        Return the sprites in the cells covered by a rect, which may or
+        may not intersect it, counting the query and its candidates.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - List of sprites, each listed once.
+        """
+        found = self.nearby(rect)
+        self.queries += 1
+        self.candidates += len(found)
+        return found
+
+    def collide(self, rect):
+        """
+        Return the sprites whose rect intersects a rect.
+
+        Parameters:
+        - rect: Pygame Rect in world coordinates.
+
+        Returns:
+        - List of sprites.
+        """
+        return [sprite for sprite in self.query(rect) if rect.colliderect(sprite.rect)]
+
+    def reset_counters(self):
+        """Reset the query and candidate counters."""
+        self.queries = 0
+        self.candidates = 0
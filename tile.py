@@ -13,6 +13,8 @@ class Tile(pygame.sprite.Sprite):
     transitions, treasure opening and other dynamics.
     - surface: Surface representing the appearance of the tile. 
     Defaults to pygame.Surface((TILESIZE,TILESIZE)).
+    - size: Size of the tile rect when it differs from the surface, used
+    for invisible boundaries merged from several cells. Defaults to None.
 
     Attributes:
     - sprite_type: Type of the tile sprite.
@@ -28,7 +30,7 @@ class Tile(pygame.sprite.Sprite):
     used for opening the open treasure image.
     """
     # special is a variable used for the value of the next level, as well as other specific dynamics
-    def __init__(self, position, groups, sprite_type, special, surface = pygame.Surface((TILESIZE,TILESIZE))):
+    def __init__(self, position, groups, sprite_type, special, surface = pygame.Surface((TILESIZE,TILESIZE)), size = None):
         """
         Initialize the Tile sprite. 
         """
@@ -45,6 +47,8 @@ class Tile(pygame.sprite.Sprite):
             self.rect = self.image.get_rect(topleft = position)
             self.rect = self.rect.inflate((15,15))
             self.type_of_chest = special
+        elif size:
+            self.rect = pygame.Rect(position, size)
         else:
             self.rect = self.image.get_rect(topleft = position)
 
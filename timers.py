@@ -0,0 +1,104 @@
+from heapq import heappush, heappop
+
+
+class Timer:
+    """
+    Handle of a scheduled callback, used to cancel it.
+
+    Parameters:
+    - time: Simulation time in milliseconds at which the timer fires.
+    - callback: Function called when the timer fires.
+    - args: Arguments passed to the callback.
+
+    Attributes:
+    - time: Simulation time in milliseconds at which the timer fires.
+    - callback: Function called when the timer fires.
+    - args: Arguments passed to the callback.
+    - cancelled: Boolean indicating whether the timer was cancelled.
+    """
+    __slots__ = ("time", "callback", "args", "cancelled")
+
+    def __init__(self, time, callback, args):
+        """Initialize a pending timer."""
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the timer, its callback will not be called."""
+        self.cancelled = True
+        self.callback = None
+        self.args = ()
+
+
+class TimerScheduler:
+    """
+    Central scheduler of delayed callbacks on simulation time, used for
+    cooldowns, invincibility windows, the end of attack animations and
+    delayed effects.
+
+    The pending timers are kept in a heap ordered by their expiry time, so
+    advancing the clock only costs work for the timers that actually fire,
+    independently of how many entities are waiting. Cancelled timers are
+    dropped lazily when they reach the top of the heap.
+
+    Attributes:
+    - time: Current simulation time in milliseconds.
+    - heap: Heap of (time, sequence number, Timer) entries.
+    - counter: Sequence number of the next timer, keeping timers with
+    the same expiry time in scheduling order.
+    - fired: Number of callbacks called in the last advance.
+
+    Methods:
+    - schedule(delay, callback, *args): Call a function after a delay.
+    - advance(milliseconds): Move the clock forward and fire the expired timers.
+    - __len__(): Return the number of pending timers, including cancelled ones.
+    """
+    def __init__(self):
+        """Initialize the scheduler at time 0 without timers."""
+        self.time = 0
+        self.heap = []
+        self.counter = 0
+        self.fired = 0
+
+    def __len__(self):
+        """Return the number of pending timers, including cancelled ones."""
+        return len(self.heap)
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call a function after a delay of simulation time.
+
+        Parameters:
+        - delay: Delay in milliseconds.
+        - callback: Function to call.
+        - args: Arguments passed to the function.
+
+        Returns:
+        - The Timer, which can be cancelled.
+        """
+        timer = Timer(self.time + delay, callback, args)
+        heappush(self.heap, (timer.time, self.counter, timer))
+        self.counter += 1
+        return timer
+
+    def advance(self, milliseconds):
+        """
+        Move the clock forward and call the callbacks of the timers that
+        expired, in the order of their expiry. Timers scheduled by a callback
+        fire in the same call if they already expired.
+
+        Parameters:
+        - milliseconds: Elapsed simulation time.
+        """
+        self.time += milliseconds
+        self.fired = 0
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            timer = heappop(heap)[2]
+            if not timer.cancelled:
+                self.fired += 1
+                callback, args = timer.callback, timer.args
+                timer.cancel()
+                callback(*args)
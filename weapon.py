@@ -1,15 +1,26 @@
 import pygame
+from settings import *
+from helpers import import_image
+
+DIRECTIONS = ("up", "down", "left", "right")
 
 class Weapon(pygame.sprite.Sprite):
     """
     Class representing a weapon sprite used by the player.
 
+    Weapon sprites are handed out by a WeaponPool and reused for every
+    swing: equip() places the sprite next to the player and adds it to
+    the groups, kill() takes it out of them again.
+
     Parameters:
-    - player: The player object associated with the weapon.
-    - groups: The sprite groups to which the weapon belongs.
+    - name: The name of the weapon in weapon_data.
+    - images: Dictionary mapping the four directions to the preloaded
+    image surfaces of the weapon.
 
     Attributes:
     - sprite_type: Type of this sprite (weapon).
+    - name: The name of the weapon in weapon_data.
+    - images: Dictionary mapping the directions to the image surfaces.
     - image: Image surface representing the weapon.
     - rect: Rectangle defining the position and size of the weapon sprite.
 
@@ -17,15 +28,26 @@ class Weapon(pygame.sprite.Sprite):
     The weapon sprite's position is determined based on the player's
     direction.
     """
-    def __init__(self, player, groups):
-        """Initialize the weapon with the given groups."""
-        super().__init__(groups)
+    def __init__(self, name, images):
+        """Initialize the weapon, not placed in any group yet."""
+        super().__init__()
         self.sprite_type = "weapon"
+        self.name = name
+        self.images = images
+        self.image = images["down"]
+        self.rect = self.image.get_rect()
+
+    def equip(self, player, groups):
+        """
+        Place the weapon in the hand of the player and add it to the groups.
+
+        Parameters:
+        - player: The player object associated with the weapon.
+        - groups: The sprite groups to which the weapon belongs.
+        """
         direction = player.status.split("_")[0]
+        self.image = self.images[direction]
 
-        full_path = f"assets/sword/{direction}.png"
-        self.image = pygame.image.load(full_path).convert_alpha()
-        
         if direction == "right":
             self.rect = self.image.get_rect(midleft = player.rect.midright + pygame.Vector2(0,16))
         elif direction == "left":
@@ -33,4 +55,58 @@ class Weapon(pygame.sprite.Sprite):
         elif direction == "down":
              self.rect = self.image.get_rect(midtop = player.rect.midbottom + pygame.Vector2(-10, 0))
         else:
-            self.rect = self.image.get_rect(midbottom = player.rect.midtop + pygame.Vector2(-10, 0))
\ No newline at end of file
+            self.rect = self.image.get_rect(midbottom = player.rect.midtop + pygame.Vector2(-10, 0))
+        self.add(groups)
+
+
+class WeaponPool:
+    """
+    Pool of reusable weapon sprites with the directional images of every
+    weapon in weapon_data loaded up front, so attacking causes no disk
+    access and no sprite allocation during combat.
+
+    Attributes:
+    - images: Dictionary mapping each weapon name to its dictionary of
+    directional image surfaces.
+    - free: Dictionary mapping each weapon name to the list of its
+    weapon sprites that are not in use.
+
+    Methods:
+    - acquire(player, groups, name): Hand out a weapon placed next to the player.
+    - release(weapon): Take a weapon out of its groups and back into the pool.
+    """
+    def __init__(self):
+        """Load the images of all weapons and create one sprite for each."""
+        self.images = {}
+        self.free = {}
+        for name in weapon_data:
+            self.images[name] = {direction: import_image(f"assets/{name}/{direction}.png") for direction in DIRECTIONS}
+            self.free[name] = [Weapon(name, self.images[name])]
+
+    def acquire(self, player, groups, name = "sword"):
+        """
+        Hand out a weapon sprite placed next to the player, creating a new
+        one only if all sprites of the weapon are in use.
+
+        Parameters:
+        - player: The player object holding the weapon.
+        - groups: The sprite groups to which the weapon belongs.
+        - name: The name of the weapon in weapon_data.
+
+        Returns:
+        - The Weapon sprite.
+        """
+        free = self.free[name]
+        weapon = free.pop() if free else Weapon(name, self.images[name])
+        weapon.equip(player, groups)
+        return weapon
+
+    def release(self, weapon):
+        """
+        Take a weapon out of its groups and back into the pool.
+
+        Parameters:
+        - weapon: A Weapon sprite handed out by acquire.
+        """
+        weapon.kill()
+        self.free[weapon.name].append(weapon)